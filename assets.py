@@ -0,0 +1,73 @@
+"""Generated images, declared once and built on first use.
+
+    img = ImageMobject(asset("gauss.png"))
+
+ASSETS maps every generated file to the construct_imshow call that makes it
+(which also writes "fft_" + file). asset returns the file name, rebuilding
+the file only when it is missing or its declaration changed since it was
+written; the declaration key of every built file is kept in STAMP_DIR.
+Files listed in STATIC have no generator and are only checked for.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+STAMP_DIR = os.path.join(".imshow_cache", ".stamps")  # inside imshow.CACHE_DIR
+
+# Centering: defect perturbation V(R, R') of a 1D crystal with supercell 2,
+# narrow along R - R' and, for the defect, along R + R'
+SIGMA_PLUS = 1
+SIGMA_MINUS = 0.1
+LIM = 3
+
+
+def gauss_periodic(x, y):
+    return np.exp(-(x-y)**2/SIGMA_MINUS) + np.exp(-(x-y-2)**2/SIGMA_MINUS) + \
+        np.exp(-(x-y+2)**2/SIGMA_MINUS)
+
+
+def gauss(x, y):
+    return np.exp(-(x-y)**2/SIGMA_MINUS - (x+y)**2/SIGMA_PLUS) + np.exp(-(x-y-2)**2/SIGMA_MINUS - (x+y-2)**2/SIGMA_PLUS) + \
+        np.exp(-(x-y+2)**2/SIGMA_MINUS - (x+y-2)**2/SIGMA_PLUS) + np.exp(-(x-y)**2/SIGMA_MINUS - (x+y-4)**2/SIGMA_PLUS)
+
+
+ASSETS = {
+    "gauss.png": dict(function=gauss, extent=[-1, LIM, -1, LIM], n_pixels=800, mapp='magma'),
+    "gauss_periodic.png": dict(function=gauss_periodic, extent=[-1, LIM, -1, LIM], n_pixels=800, mapp='magma'),
+}
+# exported by hand, no generator in the repository
+STATIC = {"fc_exp.png"}
+
+
+def asset_key(filename):
+    from imshow import function_key
+
+    spec = dict(ASSETS[filename])
+    function = spec.pop("function")
+    return hashlib.sha256("\n".join([function_key(function), repr(sorted(spec.items()))]).encode()).hexdigest()
+
+
+def asset(filename):
+    """filename, built first if it is missing or out of date."""
+    if filename not in ASSETS:
+        if not os.path.exists(filename):
+            kind = "static asset" if filename in STATIC else "file"
+            raise FileNotFoundError(f"{kind} {filename} is missing")
+        return filename
+    key = asset_key(filename)
+    stamp = os.path.join(STAMP_DIR, filename)
+    if os.path.exists(filename) and os.path.exists("fft_" + filename) and os.path.exists(stamp):
+        with open(stamp) as f:
+            if f.read() == key:
+                return filename
+    # imported here so that build.py can read ASSETS without manim
+    from imshow import construct_imshow
+
+    construct_imshow(filename, **ASSETS[filename])
+    os.makedirs(STAMP_DIR, exist_ok=True)
+    tmp = f"{stamp}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(key)
+    os.replace(tmp, stamp)
+    return filename
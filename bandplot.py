@@ -0,0 +1,188 @@
+"""Vector band-structure and linewidth figures built from cached arrays.
+
+    s0_img = figure("bands01", scale=0.4).shift(DOWN)
+
+figure draws <name>.npz when it exists and falls back to the exported
+<name>.png otherwise (tiled for camera zooms when given the camera frame),
+at the size the PNG would have as an ImageMobject, so the slides keep their
+layout either way. The npz keys select the figure:
+
+    x, bands (nk, nb)[, reference (nk, nb)]   solid bands, dashed reference
+    x, bands, widths (nk, nb)                 bands with a +-width shaded area
+    x, y, band (n,)                           linewidth scatter, one square per point
+
+and optional keys label it:
+
+    ticks (m,), tick_labels (m,)   high-symmetry points of a band path and their
+                                   names (default: the path ends and breaks, unnamed)
+    xlabel, ylabel                 axis titles
+
+The frame is a manim Axes over the data range widened to round ticks, in the
+box the exported figure's axes occupy, with numbered y ticks (and x ticks for
+the scatter) and a vertical line at every high-symmetry point. Each band is
+one VMobject whose subpaths are the path segments, dashes or squares, so a
+figure is a handful of mobjects and stays sharp when zoomed.
+"""
+import os
+
+import numpy as np
+from manim import *
+from PIL import Image
+
+from pyramid import TiledImage
+
+# band colors, lowest band first, as in the exported figures
+COLORS = ["#EFF1F3", "#F9A03F", "#D8B4A0", "#75B09C", "#007EA7", "#003459"]
+# axes box inside the figure, matplotlib's default subplot margins
+MARGINS = dict(left=0.125, right=0.9, bottom=0.11, top=0.88)
+IMAGE_RESOLUTION = 1080  # pixel height of a frame-high ImageMobject
+FONT_SIZE = 10  # label font size per frame unit of figure height
+
+
+def segments(points):
+    """Bezier points of the straight segments between consecutive points (n, 3)."""
+    t = np.linspace(0, 1, 4)[None, :, None]
+    return (points[:-1, None] * (1 - t) + points[1:, None] * t).reshape(-1, 3)
+
+
+def polylines(lines):
+    """One VMobject path through several polylines, each its own subpath."""
+    path = VMobject()
+    points = [segments(line) for line in lines if len(line) > 1]
+    path.set_points(np.concatenate(points) if points else np.zeros((0, 3)))
+    return path
+
+
+def dashes(line, dash, gap):
+    """Pieces of the polyline line (n, 3), dash long and gap apart."""
+    length = np.r_[0, np.cumsum(np.linalg.norm(np.diff(line, axis=0), axis=1))]
+    period = dash + gap
+    pieces = []
+    for start in np.arange(0, length[-1], period):
+        s = np.r_[start, length[(length > start) & (length < start + dash)], min(start + dash, length[-1])]
+        pieces.append(np.column_stack([np.interp(s, length, line[:, k]) for k in range(3)]))
+    return pieces
+
+
+def squares(centers, size):
+    """Points of a filled square of side size around each center (n, 3)."""
+    corners = np.array([[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0], [-1, -1, 0]]) * size / 2
+    corners = np.asarray(centers)[:, None] + corners[None]                 # (n, 5, 3)
+    t = np.linspace(0, 1, 4)[None, None, :, None]
+    return (corners[:, :-1, None] * (1 - t) + corners[:, 1:, None] * t).reshape(-1, 3)
+
+
+def image_size(name, scale):
+    with Image.open(name + ".png") as image:
+        width, height = image.size
+    frame_height = height / IMAGE_RESOLUTION * config["frame_height"] * scale
+    return frame_height * width / height, frame_height
+
+
+def breaks(x):
+    """Split indices of a band path where x repeats (high-symmetry points)."""
+    return np.flatnonzero(np.diff(x) == 0) + 1
+
+
+def nice_range(lo, hi, count=5):
+    """lo and hi widened to multiples of a 1, 2 or 5 times a power of ten step
+    giving at most count intervals (at least one), and the step."""
+    span = (hi - lo) or abs(hi) or 1
+    step = 10.0 ** np.floor(np.log10(span / count))
+    step *= next(m for m in (1, 2, 5, 10) if span / (step * m) <= count)
+    lo = np.floor(lo / step) * step
+    return lo, max(np.ceil(hi / step) * step, lo + step), step
+
+
+def figure(name, scale=1.0, width=None, height=None, stroke_width=4, frame=None):
+    """Vector figure of <name>.npz, or the ImageMobject of <name>.png, a
+    TiledImage following frame if given."""
+    if not os.path.exists(name + ".npz"):
+        if frame is not None:
+            return TiledImage(name + ".png", frame).scale(scale)
+        return ImageMobject(name + ".png").scale(scale)
+    if width is None:
+        width, height = image_size(name, scale)
+    data = np.load(name + ".npz")
+    left, right = (MARGINS["left"] - 0.5) * width, (MARGINS["right"] - 0.5) * width
+    bottom, top = (MARGINS["bottom"] - 0.5) * height, (MARGINS["top"] - 0.5) * height
+    x = data["x"]
+    scatter = "band" in data
+    values = [data[key] for key in ("bands", "reference", "y") if key in data]
+    if "widths" in data:
+        values += [data["bands"] + data["widths"], data["bands"] - data["widths"]]
+    y0, y1, ystep = nice_range(min(v.min() for v in values), max(v.max() for v in values))
+    if scatter:
+        x0, x1, xstep = nice_range(x.min(), x.max())
+    else:
+        x0, x1 = x.min(), x.max()
+        x1, xstep = (x1, x1 - x0) if x1 > x0 else (x0 + 1, 1)
+
+    # ranges from 0, so that the axes cross at the bottom left corner as in
+    # the exported figures; the labels carry the data values
+    font_size = FONT_SIZE * height
+    axes = Axes(x_range=[0, x1 - x0, xstep], y_range=[0, y1 - y0, ystep],
+                x_length=right - left, y_length=top - bottom, tips=False,
+                axis_config=dict(stroke_width=stroke_width / 2, tick_size=0.01 * height),
+                x_axis_config=dict(include_ticks=scatter))
+    axes.shift(np.array([left, bottom, 0]) - axes.c2p(0, 0))
+    axes.y_axis.add_labels({v - y0: Text(f"{v + 0:g}", font_size=font_size)
+                            for v in np.arange(y0, y1 + ystep / 2, ystep)})
+    if scatter:
+        axes.x_axis.add_labels({v - x0: Text(f"{v + 0:g}", font_size=font_size)
+                                for v in np.arange(x0, x1 + xstep / 2, xstep)})
+
+    def to_frame(x, y):
+        px = left + (x - x0) / (x1 - x0) * (right - left)
+        py = bottom + (y - y0) / (y1 - y0) * (top - bottom)
+        return np.column_stack([px, py, np.zeros_like(px)])
+
+    result = VGroup(axes)
+    if not scatter:
+        ticks = data["ticks"] if "ticks" in data else x[np.r_[0, breaks(x), len(x) - 1]]
+        markers = polylines([to_frame(np.array([t, t]), np.array([y0, y1])) for t in ticks])
+        result.add(markers.set_stroke(GREY, stroke_width / 2))
+        if "tick_labels" in data:
+            axes.x_axis.add_labels({t - x0: Text(str(label), font_size=font_size)
+                                    for t, label in zip(ticks, data["tick_labels"])})
+
+    if scatter:
+        centers = to_frame(x, data["y"])
+        for b in np.unique(data["band"]):
+            path = VMobject(fill_color=COLORS[b % len(COLORS)], fill_opacity=1, stroke_width=0)
+            path.set_points(squares(centers[data["band"] == b], 0.012 * width))
+            result.add(path)
+    else:
+        pieces = breaks(x)
+        for b in range(data["bands"].shape[1]):
+            color = COLORS[b % len(COLORS)]
+            line = to_frame(x, data["bands"][:, b])
+            if "widths" in data:
+                upper = to_frame(x, data["bands"][:, b] + data["widths"][:, b])
+                lower = to_frame(x, data["bands"][:, b] - data["widths"][:, b])
+                area = polylines([np.concatenate([u, l[::-1], u[:1]])
+                                  for u, l in zip(np.split(upper, pieces), np.split(lower, pieces))])
+                result.add(area.set_style(fill_color=color, fill_opacity=0.5, stroke_width=0))
+            result.add(polylines(np.split(line, pieces)).set_stroke(color, stroke_width))
+            if "reference" in data:
+                reference = to_frame(x, data["reference"][:, b])
+                dashed = [d for part in np.split(reference, pieces) for d in dashes(part, 0.02 * width, 0.01 * width)]
+                result.add(polylines(dashed).set_stroke(color, stroke_width))
+
+    if "xlabel" in data:
+        result.add(Text(str(data["xlabel"]), font_size=font_size).next_to(axes, DOWN, buff=0.02 * height))
+    if "ylabel" in data:
+        result.add(Text(str(data["ylabel"]), font_size=font_size).rotate(PI / 2)
+                   .next_to(axes, LEFT, buff=0.02 * width))
+    return result
+
+
+def transition(old, new, **kwargs):
+    """ReplacementTransform between figures of the same kind, a cross-fade
+    otherwise; tiled images always cross-fade, their tiles change with the camera."""
+    new.update()
+    if isinstance(old, TiledImage) or isinstance(new, TiledImage):
+        return AnimationGroup(FadeOut(old), FadeIn(new), **kwargs)
+    if isinstance(old, ImageMobject) == isinstance(new, ImageMobject):
+        return ReplacementTransform(old, new, **kwargs)
+    return FadeTransform(old, new, **kwargs)
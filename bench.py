@@ -0,0 +1,152 @@
+"""Benchmark the scenes of run.sh and compare against a stored baseline.
+
+    python bench.py                       # all scenes at -ql, -qm and -qh
+    python bench.py -q l Centering        # one scene, low quality
+    python bench.py --save-baseline       # accept the current numbers
+    python bench.py --tolerance wall=0.3  # allow 30% slower renders
+    python bench.py --no-holds            # encode frozen waits frame by frame
+
+Scenes are rendered one at a time with manim's cache disabled, after the
+TeX pre-compilation, so the numbers measure rendering. Like build.py they
+render with --holds unless --no-holds is given; the mode is stored with every
+result and scenes are only compared against a baseline of the same mode.
+The presentations go to bench/slides, never to the deck build.py maintains.
+Every run writes bench/latest.json; regressions beyond the tolerances exit
+with status 1.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import build
+import texcache
+
+BENCH_DIR = "bench"
+BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+LATEST = os.path.join(BENCH_DIR, "latest.json")
+# kept apart from build.SLIDES_DIR, which holds the deck at the quality build.py rendered
+SLIDES_DIR = os.path.join(BENCH_DIR, "slides")
+# relative increase allowed before a metric counts as a regression
+TOLERANCES = {"wall": 0.2, "rss": 0.2, "frames": 0.0, "size": 0.25}
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def measure(scene, quality, holds=True):
+    """Wall time, peak RSS (bytes), frames written and slide output size of one render."""
+    profile_dir = os.path.join(BENCH_DIR, "profile")
+    command = [sys.executable, "render.py", "--profile", *(["--holds"] if holds else []),
+               "--output", SLIDES_DIR,
+               *build.with_quality(scene.command, quality)[1:], "--disable_caching"]
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            env=dict(os.environ, PROFILE_DIR=profile_dir))
+    output = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        sys.stderr.write(output.decode(errors="replace"))
+        raise RuntimeError(f"{scene.name} failed at -q{quality}")
+    with open(os.path.join(profile_dir, scene.name + ".json")) as f:
+        frames = json.load(f)["frames"]
+    return {
+        "wall": wall,
+        "rss": usage.ru_maxrss * 1024,
+        "frames": frames,
+        "size": directory_size(os.path.join(SLIDES_DIR, "files", scene.name))
+                + os.path.getsize(os.path.join(SLIDES_DIR, scene.name + ".json")),
+        "holds": holds,
+    }
+
+
+def compare(results, baseline, tolerances):
+    """Lines describing the metrics that grew beyond their tolerance."""
+    regressions = []
+    for quality, scenes in results.items():
+        for name, metrics in scenes.items():
+            reference = baseline.get(quality, {}).get(name)
+            # baselines from before the holds mode was recorded rendered without it
+            if reference is None or reference.get("holds", False) != metrics["holds"]:
+                continue
+            for metric, tolerance in tolerances.items():
+                old, new = reference[metric], metrics[metric]
+                if new > old * (1 + tolerance):
+                    regressions.append(f"{name} -q{quality} {metric}: {old:.4g} -> {new:.4g} "
+                                       f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%, "
+                                       f"tolerance {tolerance * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help="scene names (default: all of run.sh)")
+    parser.add_argument("-q", "--quality", action="append", choices=["l", "m", "h"],
+                        help="qualities to benchmark, repeatable (default: l, m and h)")
+    parser.add_argument("--tolerance", action="append", default=[], metavar="METRIC=FRACTION",
+                        help=f"override a relative tolerance, metrics: {', '.join(TOLERANCES)}")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"store the results as {BASELINE}")
+    parser.add_argument("--no-holds", dest="holds", action="store_false",
+                        help="encode frozen waits frame by frame, as build.py --no-holds")
+    args = parser.parse_args()
+
+    tolerances = dict(TOLERANCES)
+    for item in args.tolerance:
+        metric, _, value = item.partition("=")
+        if metric not in TOLERANCES:
+            parser.error(f"unknown metric {metric}")
+        tolerances[metric] = float(value)
+
+    scenes = build.read_scenes()
+    if args.scenes:
+        scenes = [scene for scene in scenes if scene.name in args.scenes]
+    texcache.precompile(texcache.collect(sorted({scene.file for scene in scenes})))
+
+    results = {}
+    for quality in args.quality or ["l", "m", "h"]:
+        results[quality] = {}
+        for scene in scenes:
+            metrics = measure(scene, quality, args.holds)
+            results[quality][scene.name] = metrics
+            print(f"-q{quality} {scene.name:<20} {metrics['wall']:7.1f}s "
+                  f"{metrics['rss'] / 2**20:7.0f} MB {metrics['frames']:6d} frames "
+                  f"{metrics['size'] / 2**20:7.1f} MB")
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    with open(LATEST, "w") as f:
+        json.dump(results, f, indent=1)
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE):
+            with open(BASELINE) as f:
+                baseline = json.load(f)
+        for quality, scenes in results.items():
+            baseline.setdefault(quality, {}).update(scenes)
+        with open(BASELINE, "w") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        return 0
+    if not os.path.exists(BASELINE):
+        print("no baseline yet, store one with --save-baseline")
+        return 0
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+    for quality, scenes in results.items():
+        for name, metrics in scenes.items():
+            reference = baseline.get(quality, {}).get(name)
+            if reference is not None and reference.get("holds", False) != metrics["holds"]:
+                print(f"{name} -q{quality}: baseline rendered {'with' if reference.get('holds') else 'without'} "
+                      f"holds, not compared")
+    regressions = compare(results, baseline, tolerances)
+    for line in regressions:
+        print("REGRESSION", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Render the scenes listed in run.sh in parallel.
+
+    python build.py --jobs 4
+    python build.py Centering Degeneracy
+    python build.py --incremental    # only scenes whose inputs changed
+    python build.py --no-tex         # skip the Tex/MathTex pre-compilation
+    python build.py --profile        # then python profiler.py for the hotspots
+    python build.py --no-holds       # encode frozen waits frame by frame
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import texcache
+from assets import ASSETS
+
+RUN_SCRIPT = "run.sh"
+STATE_FILE = ".build_state.json"
+SLIDES_DIR = "slides"  # manim-slides output folder
+
+# image files each scene writes and reads: a scene reading a file written by
+# another scene only starts once the writer has finished
+WRITES = {
+    "FourierRotation": ["fc.png", "fft_fc.png"],
+}
+READS = {
+    "FourierRotation": ["fc.png", "fft_fc.png"],
+    "Centering": ["gauss.png", "gauss_periodic.png", "fc_exp.png"],
+    "Degeneracy": ["bands01.png", "bands01_deg.png", "lw_grid.png",
+                   "lw_grid_deg.png", "lw_bands.png"],
+}
+# data a scene uses when present (bandplot draws <name>.npz instead of the png)
+OPTIONAL_READS = {
+    "Degeneracy": ["bands01.npz", "bands01_deg.npz", "lw_grid.npz",
+                   "lw_grid_deg.npz", "lw_bands.npz"],
+}
+
+QUALITIES = ("-ql", "-qm", "-qh", "-qp", "-qk")
+
+Scene = namedtuple("Scene", ["file", "name", "command"])
+lock = threading.Lock()
+
+
+def read_scenes(path=RUN_SCRIPT):
+    """Parse the manim invocations of run.sh, expanding its shell variables."""
+    variables = {}
+    scenes = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, eq, value = line.partition("=")
+            if eq and name.isidentifier():
+                variables[name] = shlex.split(value)[0]
+                continue
+            args = []
+            for token in shlex.split(line):
+                if token.startswith("$") and token[1:] in variables:
+                    args += shlex.split(variables[token[1:]])
+                else:
+                    args.append(token)
+            if not args or args[0] != "manim":
+                continue
+            files = [a for a in args if a.endswith(".py")]
+            scenes.append(Scene(files[0], args[-1], args))
+    return scenes
+
+
+def producers(scenes):
+    """Map each written asset to its scene and each scene to the scenes it waits for."""
+    written_by = {}
+    for scene in scenes:
+        for asset in WRITES.get(scene.name, []):
+            written_by[asset] = scene.name
+    deps = {}
+    for scene in scenes:
+        deps[scene.name] = {written_by[asset] for asset in READS.get(scene.name, [])
+                            if asset in written_by and written_by[asset] != scene.name}
+    return written_by, deps
+
+
+def check_assets(scenes, written_by):
+    """Report the images a scene reads that nothing writes or generates."""
+    missing = [(scene.name, asset) for scene in scenes for asset in READS.get(scene.name, [])
+               if asset not in written_by and asset not in ASSETS and not os.path.exists(asset)]
+    for name, asset in missing:
+        print(f"{name}: missing {asset}", file=sys.stderr)
+    return not missing
+
+
+def local_imports(source):
+    """Names of the repository modules imported by source."""
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names |= {alias.name.split(".")[0] for alias in node.names}
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return {name for name in names if os.path.exists(name + ".py")}
+
+
+def scene_hash(scene, command):
+    """Hash of everything a scene render depends on: the command line, the
+    scene class and the module-level code around it, the repository modules
+    it imports (recursively) and the image files it reads."""
+    h = hashlib.sha256(" ".join(command).encode())
+    with open(scene.file) as f:
+        source = f.read()
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef) or node.name == scene.name:
+            h.update(ast.get_source_segment(source, node).encode())
+
+    modules, queue = set(), local_imports(source)
+    while queue:
+        module = queue.pop()
+        modules.add(module)
+        with open(module + ".py") as f:
+            queue |= local_imports(f.read()) - modules
+    for module in sorted(modules):
+        with open(module + ".py", "rb") as f:
+            h.update(f.read())
+
+    for asset in READS.get(scene.name, []) + OPTIONAL_READS.get(scene.name, []):
+        # generated assets are covered by the hash of assets.py
+        if asset not in WRITES.get(scene.name, []) and asset not in ASSETS and os.path.exists(asset):
+            with open(asset, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {}
+    with open(STATE_FILE) as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(STATE_FILE + ".tmp", "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(STATE_FILE + ".tmp", STATE_FILE)
+
+
+def dirty_scenes(scenes, deps, quality, flags, state):
+    """Scenes whose inputs changed since their last successful render, whose
+    manim-slides output is missing, or that read assets of a dirty scene."""
+    dirty = {scene.name for scene in scenes
+             if state.get(scene.name) != scene_hash(scene, hashed_command(scene, quality, flags))
+             or not os.path.exists(os.path.join(SLIDES_DIR, scene.name + ".json"))}
+    changed = True
+    while changed:
+        changed = False
+        for scene in scenes:
+            if scene.name not in dirty and deps[scene.name] & dirty:
+                dirty.add(scene.name)
+                changed = True
+    return dirty
+
+
+def with_quality(command, quality):
+    if quality is None:
+        return command
+    return [command[0], "-q" + quality] + [a for a in command[1:] if a not in QUALITIES]
+
+
+def hashed_command(scene, quality, flags):
+    """The render options of a scene that change its output: the manim command
+    line and the render.py flags it runs with."""
+    return [*flags, *with_quality(scene.command, quality)]
+
+
+def launcher(command, flags):
+    """Run the manim command through render.py when any of its flags are set."""
+    if not flags:
+        return command
+    return [sys.executable, "render.py", *flags, *command[1:]]
+
+
+def render(scene, command, processes, stop):
+    start = time.perf_counter()
+    with lock:
+        if stop.is_set():
+            return -1, 0.0, ""
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        processes[scene.name] = proc
+    output, _ = proc.communicate()
+    return proc.returncode, time.perf_counter() - start, output
+
+
+def build(scenes, jobs, quality=None, incremental=False, tex=True, flags=()):
+    written_by, deps = producers(scenes)
+    if not check_assets(scenes, written_by):
+        return 1
+    done = set()
+    pending = list(scenes)
+    # every successful render is recorded, so an incremental build after a
+    # full one only renders what changed since
+    state = load_state()
+    if incremental:
+        dirty = dirty_scenes(scenes, deps, quality, flags, state)
+        for scene in scenes:
+            if scene.name not in dirty:
+                print(f"{scene.name:<20} up to date")
+                done.add(scene.name)
+        pending = [scene for scene in scenes if scene.name in dirty]
+    if tex and pending:
+        tex_start = time.perf_counter()
+        texcache.precompile(texcache.collect(sorted({scene.file for scene in pending})), jobs)
+        print(f"{'tex':<20} {time.perf_counter() - tex_start:7.1f}s")
+    running = {}
+    processes = {}
+    stop = threading.Event()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for scene in list(pending):
+                if len(running) >= jobs:
+                    break
+                if deps[scene.name] <= done:
+                    pending.remove(scene)
+                    command = launcher(with_quality(scene.command, quality), flags)
+                    future = pool.submit(render, scene, command, processes, stop)
+                    running[future] = scene
+            if not running:
+                print("circular asset dependencies between "
+                      + ", ".join(scene.name for scene in pending), file=sys.stderr)
+                return 1
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                scene = running.pop(future)
+                code, elapsed, output = future.result()
+                if code != 0:
+                    with lock:
+                        stop.set()
+                        for proc in processes.values():
+                            if proc.poll() is None:
+                                proc.terminate()
+                    print(output, file=sys.stderr)
+                    print(f"{scene.name:<20} FAILED after {elapsed:.1f}s", file=sys.stderr)
+                    return code
+                done.add(scene.name)
+                print(f"{scene.name:<20} {elapsed:7.1f}s")
+                state[scene.name] = scene_hash(scene, hashed_command(scene, quality, flags))
+                save_state(state)
+    print(f"{'total':<20} {time.perf_counter() - start:7.1f}s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenes", nargs="*", help="scene names to render (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of scenes rendered at the same time")
+    parser.add_argument("-q", "--quality", choices=[q[-1] for q in QUALITIES],
+                        help="override the -q flag of run.sh")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="only render scenes whose sources, imports or images changed, "
+                             "reusing the existing movies and manim-slides JSON of the others")
+    parser.add_argument("--no-tex", dest="tex", action="store_false",
+                        help="skip compiling the slides' Tex/MathTex strings before rendering")
+    parser.add_argument("--profile", action="store_true",
+                        help="record per-call timings in profile/, see profiler.py")
+    parser.add_argument("--no-holds", dest="holds", action="store_false",
+                        help="encode frozen waits frame by frame instead of as two frames (holds.py)")
+    args = parser.parse_args()
+
+    scenes = read_scenes()
+    if args.scenes:
+        unknown = set(args.scenes) - {scene.name for scene in scenes}
+        if unknown:
+            parser.error(f"unknown scenes: {', '.join(sorted(unknown))}")
+        scenes = [scene for scene in scenes if scene.name in args.scenes]
+    flags = (["--profile"] if args.profile else []) + (["--holds"] if args.holds else [])
+    return build(scenes, max(1, args.jobs), args.quality, args.incremental, args.tex, flags)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
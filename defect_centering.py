@@ -0,0 +1,69 @@
+"""Perimeter-minimizing centering of defect force constants.
+
+    pair, T1, T2, weight = center_pairs(tau, cell, supercell, defect)
+
+For every atom pair (a, b) of a defect supercell, the replicas A = tau_a + N T1
+and B = tau_b + N T2 kept for V(R, R') are the ones minimizing the perimeter
+|A - D| + |B - D| + |A - B| of the triangle with the defect D; n tied replicas
+get weight 1/n. The result is flat: row k says pair[k] uses offsets T1[k],
+T2[k] with weight[k].
+
+Instead of trying every (T1, T2), the replicas of each atom are sorted once by
+their distance to D. The perimeter is at least 2 max(|A - D|, |B - D|), and
+the two closest replicas give an upper bound, so only the few replicas within
+half that bound are paired, a chunk of pairs at a time.
+"""
+import itertools
+
+import numpy as np
+
+
+def replica_distances(tau, cell, supercell, defect, search=2):
+    """Offsets T (nT, d), and for every atom its replicas sorted by distance to
+    the defect: order (nat, nT) into T, Cartesian positions and distances."""
+    N = np.asarray(supercell)
+    T = np.array(list(itertools.product(range(-search, search + 1), repeat=len(N))))
+    positions = (np.asarray(tau, dtype=float)[:, None] + T * N) @ cell
+    distance = np.linalg.norm(positions - np.asarray(defect, dtype=float) @ cell, axis=-1)
+    order = np.argsort(distance, axis=1)
+    return (T, order, np.take_along_axis(positions, order[..., None], axis=1),
+            np.take_along_axis(distance, order, axis=1))
+
+
+def center_pairs(tau, cell, supercell, defect, pairs=None, search=2, tol=1e-6, chunk=16384):
+    """Weighted replica lists (pair, T1, T2, weight) of the pairs (npairs, 2),
+    by default all atom pairs, with tau and defect in crystal coordinates."""
+    T, order, positions, distance = replica_distances(tau, cell, supercell, defect, search)
+    nat = len(distance)
+    if pairs is None:
+        pairs = np.indices((nat, nat)).reshape(2, -1).T
+    pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+    # no perimeter exceeds 4 times the largest closest-replica distance
+    width = int((2 * distance <= 4 * distance[:, 0].max() * (1 + tol) + tol).sum(axis=1).max())
+    # an empty entry keeps the widths of the columns when there are no pairs
+    found = [(np.zeros(0, dtype=np.intp), T[:0], T[:0], np.zeros(0))]
+    for start in range(0, len(pairs), chunk):
+        a, b = pairs[start:start + chunk].T
+        upper = distance[a, 0] + distance[b, 0] \
+            + np.linalg.norm(positions[a, 0] - positions[b, 0], axis=-1)
+        bound = upper[:, None] * (1 + tol) + tol
+        na = (2 * distance[a, :width] <= bound).sum(axis=1)
+        nb = (2 * distance[b, :width] <= bound).sum(axis=1)
+        needed = np.maximum(na, nb)
+        # pairs needing the same number of replicas are paired together
+        for k in np.unique(needed):
+            rows = np.flatnonzero(needed == k)
+            ra, rb = a[rows], b[rows]
+            columns = np.arange(k)
+            dA = np.where(columns < na[rows, None], distance[ra, :k], np.inf)
+            dB = np.where(columns < nb[rows, None], distance[rb, :k], np.inf)
+            perimeter = dA[:, :, None] + dB[:, None, :] + np.linalg.norm(
+                positions[ra, :k, None] - positions[rb, None, :k], axis=-1)
+            best = perimeter.min(axis=(1, 2))
+            keep = perimeter <= best[:, None, None] * (1 + tol) + tol
+            p, i, j = np.nonzero(keep)
+            found.append((start + rows[p], T[order[ra[p], i]], T[order[rb[p], j]],
+                          1 / keep.sum(axis=(1, 2))[p]))
+    pair, T1, T2, weight = (np.concatenate(column) for column in zip(*found))
+    by_pair = np.argsort(pair, kind="stable")
+    return pair[by_pair], T1[by_pair], T2[by_pair], weight[by_pair]
@@ -0,0 +1,90 @@
+"""Defect perturbation V(R, R') = FC_defect - FC_pristine, in sparse blocks.
+
+    cells, basis = atom_map(sc_positions, tau, supercell)
+    V = difference(fc_defect, fc_pristine, cells, basis, supercell, cutoff=1e-5)
+    save("V.npz", V)
+    Vd = dense(V, supercell, len(tau))       # V[R, R', i, j] for double_fourier
+
+fc_defect (n, n, 3, 3) are the force constants between the n atoms of the
+defect supercell, e.g. the Gamma dyn file of the supercell times the masses,
+possibly memory-mapped. fc_pristine (N, nat, nat, 3, 3) are the unit cell
+force constants on the cells R of the same supercell (dynmat layout, R in C
+order over the supercell). Every supercell atom is mapped once to its cell
+and basis atom, so the pristine block of any pair is a lookup through integer
+index maps. Rows of pairs are processed a chunk at a time, and 3x3 blocks
+whose largest entry is below cutoff are dropped: V decays fast away from the
+defect, so the kept blocks are a small fraction of the dense 3n x 3n matrix.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# block-sparse V: pair (k,) row and column atoms, blocks (k, 3, 3), and for
+# every supercell atom its cell (n, d) and basis atom (n,)
+SparseV = namedtuple("SparseV", ["rows", "cols", "blocks", "cells", "basis"])
+
+
+def atom_map(positions, tau, supercell, tol=0.05):
+    """Cell (n, d) inside the supercell and basis index (n,) of every supercell
+    atom. positions and tau are in crystal coordinates of the unit cell; an
+    atom is matched to the basis site it is closer than tol to."""
+    offset = np.asarray(positions, dtype=float)[:, None] - np.asarray(tau, dtype=float)[None]
+    cell = np.round(offset)
+    error = np.linalg.norm(offset - cell, axis=-1)
+    basis = np.argmin(error, axis=1)
+    atoms = np.arange(len(basis))
+    unmatched = np.flatnonzero(error[atoms, basis] > tol)
+    if len(unmatched):
+        raise ValueError(f"supercell atoms {unmatched.tolist()} are not on a unit cell site")
+    return cell[atoms, basis].astype(int) % np.asarray(supercell), basis
+
+
+def difference(fc_defect, fc_pristine, cells, basis, supercell, cutoff=0.0, chunk=256):
+    """SparseV of fc_defect - fc_pristine, blocks with max |V| <= cutoff left out."""
+    N = tuple(supercell)
+    n = len(basis)
+    found = []
+    for start in range(0, n, chunk):
+        rows = np.arange(start, min(start + chunk, n))
+        # R' - R of every pair of the chunk, as an index into the cells of fc_pristine
+        shift = np.ravel_multi_index(((cells[None] - cells[rows, None]) % N).transpose(2, 0, 1), N)
+        V = np.asarray(fc_defect[start:start + chunk]).real \
+            - fc_pristine[shift, basis[rows, None], basis[None]].real
+        i, j = np.nonzero(np.abs(V).max(axis=(2, 3)) > cutoff)
+        found.append((rows[i], j, V[i, j]))
+    rows, cols, blocks = (np.concatenate(column) for column in zip(*found))
+    return SparseV(rows, cols, blocks, cells, basis)
+
+
+def save(path, V):
+    np.savez(path, **V._asdict())
+
+
+def load(path):
+    data = np.load(path)
+    return SparseV(*(data[field] for field in SparseV._fields))
+
+
+def to_bsr(V):
+    """V as a scipy (3n, 3n) block sparse matrix over the supercell atoms,
+    e.g. for tmatrix.tmatrix_krylov."""
+    from scipy.sparse import bsr_matrix
+
+    n = len(V.basis)
+    order = np.lexsort((V.cols, V.rows))
+    indptr = np.searchsorted(V.rows[order], np.arange(n + 1))
+    return bsr_matrix((V.blocks[order], V.cols[order], indptr), shape=(3 * n, 3 * n))
+
+
+def dense(V, supercell, nat, out=None):
+    """V[R, R', (tau, alpha), (tau', beta)] (N, N, 3 nat, 3 nat), the layout of
+    double_fourier, written into out (e.g. an open_memmap) when given."""
+    N = int(np.prod(supercell))
+    if out is None:
+        out = np.zeros((N, N, 3 * nat, 3 * nat))
+    R = np.ravel_multi_index(V.cells.T, tuple(supercell))
+    a, b = V.basis[V.rows], V.basis[V.cols]
+    for alpha in range(3):
+        for beta in range(3):
+            out[R[V.rows], R[V.cols], 3 * a + alpha, 3 * b + beta] = V.blocks[:, alpha, beta]
+    return out
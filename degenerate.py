@@ -0,0 +1,55 @@
+"""Degenerate perturbation theory for basis-independent linewidths.
+
+    modes, e1 = rotate_degenerate(energies, modes, Vqq, tol=1e-6)
+    gamma = linewidth.linewidths(Vqq, energies, modes, sigma)
+
+Inside a degenerate subspace eigh returns any rotation of the kets, and the
+first-order energies <qs|V(q, -q)|qs> and the linewidths depend on it (the
+get_e1 demo of Degeneracy). Here the kets of each degenerate cluster are
+rotated to the ones diagonalizing V(q, -q) in the cluster. Clusters are found
+for every q at once, and all clusters of the same size, across q, go through
+a single batched eigh. The tolerance is relative to the largest |energy|, so
+it holds in any units.
+"""
+import numpy as np
+
+import linewidth
+
+
+def clusters(energies, tol):
+    """Cluster label (nq, nb) of every band: bands of one q whose sorted
+    energies are closer than tol * max|energies| to the previous one share a label."""
+    gaps = np.diff(energies, axis=1) > tol * np.abs(energies).max()
+    labels = np.concatenate([np.ones((len(energies), 1), dtype=int), gaps], axis=1)
+    # labels unique over the whole grid
+    return np.cumsum(labels.ravel()).reshape(energies.shape) - 1
+
+
+def rotate_degenerate(energies, modes, Vqq, tol=1e-6):
+    """Eigenvectors (nq, nb, nb) rotated inside each degenerate cluster so that
+    the diagonal blocks V(q, q) of Vqq are diagonal there, and the first-order
+    energies (nq, nb) in that basis. energies must be sorted for every q; bands
+    are degenerate within tol relative to the largest |energy|, see clusters."""
+    nq, nb = energies.shape
+    diagonal = np.asarray(Vqq[np.arange(nq), np.arange(nq)])           # (nq, nb, nb)
+    modes = modes.copy()
+    labels = clusters(energies, tol).ravel()
+    start = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    size = np.diff(np.r_[start, labels.size])
+    for k in np.unique(size[size > 1]):
+        first = start[size == k]
+        q, band = np.divmod(first, nb)
+        bands = band[:, None] + np.arange(k)                            # (m, k)
+        kets = np.take_along_axis(modes[q], bands[:, None, :], axis=2)  # (m, nb, k)
+        block = kets.conj().swapaxes(1, 2) @ diagonal[q] @ kets         # (m, k, k)
+        _, rotation = np.linalg.eigh(block)
+        rotated = kets @ rotation                                       # (m, nb, k)
+        modes[q[:, None], :, bands] = rotated.swapaxes(1, 2)
+    e1 = np.einsum("qis,qij,qjs->qs", modes.conj(), diagonal, modes).real
+    return modes, e1
+
+
+def linewidths(Vqq, energies, modes, sigma, tol=1e-6, **kwargs):
+    """linewidth.linewidths in the degenerate-rotated basis."""
+    modes, _ = rotate_degenerate(energies, modes, Vqq, tol)
+    return linewidth.linewidths(Vqq, energies, modes, sigma, **kwargs)
@@ -0,0 +1,78 @@
+"""Double Fourier transform of defect force constants, V(R, R') -> V(q, q').
+
+    Vqq = transform(np.load("V.npy", mmap_mode="r"), supercell=(8, 8, 8), path="Vqq.npy")
+    block = Vqq[iq]                      # (nq, nb, nb), read from disk on access
+    for rows, block in stream(V, supercell):   # nothing written but a scratch file
+
+V is indexed V[R, R', i, j]: R and R' run over the cells of the supercell in
+C order (the order of dynmat.q_grid), i and j over the nb = 3 nat atomic
+displacements. With q = k / N,
+
+    V(q, q') = 1/N sum_{R, R'} exp(-2 pi i q.R) V(R, R') exp(2 pi i q'.R')
+
+which is diagonal, V(q, q) = V(q), for a translation invariant V. Instead of
+the O(N^4) double sum per block, the transform is two passes of FFTs over
+the cell axes: first over R for a chunk of R' at a time into an on-disk
+intermediate, then over R' for a chunk of q at a time, so neither V nor the
+q x q' tensor has to fit in memory.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+MEMORY = 256 * 2**20  # bytes of complex blocks held at once
+
+
+def _chunk(n_cells, nb, memory):
+    return max(1, memory // (16 * n_cells * nb * nb))
+
+
+def _half(V, supercell, path, memory):
+    """First pass: exp(-2 pi i q.R) summed over R, stored as [q, R', i, j]."""
+    N = tuple(supercell)
+    n_cells, nb = V.shape[0], V.shape[-1]
+    half = np.lib.format.open_memmap(path, mode="w+", dtype=np.complex128,
+                                     shape=(n_cells, n_cells, nb, nb))
+    chunk = _chunk(n_cells, nb, memory)
+    axes = tuple(range(len(N)))
+    for start in range(0, n_cells, chunk):
+        block = np.asarray(V[:, start:start + chunk])
+        block = np.fft.fftn(block.reshape(N + block.shape[1:]), axes=axes)
+        half[:, start:start + chunk] = block.reshape(n_cells, -1, nb, nb)
+    half.flush()
+    return half
+
+
+def stream(V, supercell, memory=MEMORY, scratch=None):
+    """Yield (rows, V(q, q')[rows]) for consecutive chunks of q rows, keeping
+    only one chunk and a scratch file of the size of V."""
+    N = tuple(supercell)
+    n_cells, nb = V.shape[0], V.shape[-1]
+    fd, path = tempfile.mkstemp(suffix=".npy", dir=scratch)
+    os.close(fd)
+    try:
+        half = _half(V, N, path, memory)
+        chunk = _chunk(n_cells, nb, memory)
+        axes = tuple(range(1, len(N) + 1))
+        for start in range(0, n_cells, chunk):
+            block = np.asarray(half[start:start + chunk])
+            # ifftn divides by N, the 1/N of the definition
+            block = np.fft.ifftn(block.reshape((len(block),) + N + (nb, nb)), axes=axes)
+            yield np.arange(start, start + len(block)), block.reshape(len(block), n_cells, nb, nb)
+        del half
+    finally:
+        os.remove(path)
+
+
+def transform(V, supercell, path, memory=MEMORY):
+    """Write all of V(q, q') to the .npy file path and return it memory-mapped,
+    so per-q slices are only read when indexed."""
+    n_cells, nb = V.shape[0], V.shape[-1]
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.complex128,
+                                    shape=(n_cells, n_cells, nb, nb))
+    for rows, block in stream(V, supercell, memory, scratch=os.path.dirname(os.path.abspath(path))):
+        out[rows] = block
+    out.flush()
+    del out
+    return np.load(path, mmap_mode="r")
@@ -0,0 +1,125 @@
+"""Memory-mapped reader for Quantum ESPRESSO ph.x dynamical-matrix files.
+
+    dyn = read_dyn("si.dyn3")
+    dyn.q                    # (nq, 3) q-points of the star, 2 pi / alat
+    dyn.blocks[iq, a, b]     # (3, 3) complex block, Ry/bohr^2, paged in on access
+    grid = read_grid("si.dyn")   # every dyn file listed in si.dyn0
+
+The text is parsed once, a bounded batch of blocks at a time, into
+CACHE_DIR: the raw complex128 blocks (nq, nat, nat, 3, 3) and an index.npz
+with the q-points and the header. Later reads of an unchanged file only open
+the index and memory-map the blocks, whatever the size of the file.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+CACHE_DIR = ".dyn_cache"
+BATCH = 4096  # 3x3 blocks parsed and written at a time
+
+DynMatrix = namedtuple("DynMatrix", ["q", "blocks", "masses", "species", "positions",
+                                     "ibrav", "celldm", "cell"])
+
+
+def cache_key(path):
+    stat = os.stat(path)
+    return hashlib.sha256(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def parse_header(lines):
+    """Header of a dyn file, from the iterator lines positioned at its start."""
+    next(lines), next(lines)
+    fields = next(lines).split()
+    ntyp, nat, ibrav = int(fields[0]), int(fields[1]), int(fields[2])
+    celldm = np.array(fields[3:9], dtype=float)
+    cell = None
+    if ibrav == 0:
+        next(lines)  # "Basis vectors"
+        cell = np.array([next(lines).split() for _ in range(3)], dtype=float)
+    species, masses = [], []
+    for _ in range(ntyp):
+        line = next(lines)
+        name = line.split("'")[1].strip()
+        species.append(name)
+        masses.append(float(line.split("'")[2]))
+    types, positions = [], []
+    for _ in range(nat):
+        fields = next(lines).split()
+        types.append(int(fields[1]) - 1)
+        positions.append(fields[2:5])
+    return dict(ibrav=ibrav, celldm=celldm, cell=cell, species=np.array(species)[types],
+                masses=np.array(masses)[types], positions=np.array(positions, dtype=float))
+
+
+def parse_blocks(lines, nat, out):
+    """Append the (nat, nat, 3, 3) block of every q of the file to the binary
+    file out, and return the q-points."""
+    qs = []
+    for line in lines:
+        if "Diagonalizing" in line:
+            break
+        if "Dynamical" not in line or "Matrix" not in line:
+            continue
+        line = next(lines)
+        while "q = (" not in line:
+            line = next(lines)
+        qs.append([float(x) for x in line.split("(")[1].split(")")[0].split()])
+        next(lines)
+        # BATCH 3x3 blocks at a time: memory does not grow with nat^2
+        for start in range(0, nat * nat, BATCH):
+            rows = []
+            for _ in range(min(BATCH, nat * nat - start)):
+                next(lines)  # "na nb"
+                rows += [next(lines), next(lines), next(lines)]
+            values = np.array(" ".join(rows).split(), dtype=float)
+            out.write((values[0::2] + 1j * values[1::2]).tobytes())
+    return np.array(qs).reshape(-1, 3)
+
+
+def convert(path, entry):
+    """Parse path into the cache directory entry."""
+    with open(path) as f, open(os.path.join(entry, "blocks.bin"), "wb") as out:
+        lines = iter(f)
+        header = parse_header(lines)
+        q = parse_blocks(lines, len(header["positions"]), out)
+    cell = header.pop("cell")
+    np.savez(os.path.join(entry, "index.npz"), q=q, has_cell=cell is not None,
+             cell=np.zeros((3, 3)) if cell is None else cell, **header)
+
+
+def read_dyn(path, cache_dir=CACHE_DIR):
+    """The dynamical matrices of one dyn file, converted on first use."""
+    entry = os.path.join(cache_dir, cache_key(path))
+    if not os.path.isdir(entry):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp")
+        try:
+            convert(path, tmp)
+            os.rename(tmp, entry)
+        except OSError:
+            # another process converted it first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+    index = np.load(os.path.join(entry, "index.npz"))
+    nat = len(index["positions"])
+    blocks = np.memmap(os.path.join(entry, "blocks.bin"), dtype=np.complex128, mode="r",
+                       shape=(len(index["q"]), nat, nat, 3, 3))
+    return DynMatrix(index["q"], blocks, index["masses"], index["species"], index["positions"],
+                     int(index["ibrav"]), index["celldm"],
+                     index["cell"] if index["has_cell"] else None)
+
+
+def read_grid(prefix, cache_dir=CACHE_DIR):
+    """Grid shape and the DynMatrix of every irreducible q of prefix0."""
+    with open(prefix + "0") as f:
+        shape = tuple(int(n) for n in f.readline().split())
+        n_irreducible = int(f.readline())
+    return shape, [read_dyn(f"{prefix}{i}", cache_dir) for i in range(1, n_irreducible + 1)]
@@ -0,0 +1,53 @@
+"""Dynamical matrices and phonon modes of a periodic lattice.
+
+    F, R = diatomic_chain(k1=1.0, k2=0.5)
+    omega, modes = phonons(F, R, masses=[1.0, 3.0], q=q_grid(64))
+
+Force constants are F[r, tau1, tau2, alpha1, alpha2], the coupling between
+atom tau1 of cell 0 and atom tau2 of cell R[r]. Cells R and wavevectors q are
+in crystal coordinates, so the phase of cell R at q is exp(2 pi i q.R). Whole
+q-grids are handled at once: D(q) is one matrix product against the phase
+table and the stack is diagonalized by a single batched eigh.
+"""
+import numpy as np
+
+
+def q_grid(*shape):
+    """(N1*N2*..., d) points of the Monkhorst-Pack grid of the given shape, in [0, 1)."""
+    axes = [np.arange(n) / n for n in shape]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(shape))
+
+
+def dynamical_matrix(F, R, masses, q):
+    """(nq, nat*d, nat*d) mass-scaled dynamical matrices at the wavevectors q (nq, d)."""
+    F = np.asarray(F)
+    n_cells, nat, _, d, _ = F.shape
+    phases = np.exp(2j * np.pi * np.atleast_2d(q) @ np.asarray(R, dtype=float).T)
+    # rows (tau1, alpha1), columns (tau2, alpha2)
+    blocks = F.transpose(0, 1, 3, 2, 4).reshape(n_cells, (nat * d) ** 2)
+    D = (phases @ blocks).reshape(-1, nat * d, nat * d)
+    scale = 1 / np.sqrt(np.repeat(np.asarray(masses, dtype=float), d))
+    return D * np.outer(scale, scale)
+
+
+def phonons(F, R, masses, q):
+    """Frequencies (nq, nat*d), ascending, and eigenvectors (nq, nat*d, nat*d),
+    one per column. Unstable modes get negative frequencies."""
+    D = dynamical_matrix(F, R, masses, q)
+    # force constants truncated to a finite set of cells break hermiticity slightly
+    D = (D + D.conj().swapaxes(-1, -2)) / 2
+    omega2, modes = np.linalg.eigh(D)
+    return np.sign(omega2) * np.sqrt(np.abs(omega2)), modes
+
+
+def diatomic_chain(k1, k2=None):
+    """Force constants (3, 2, 2, 1, 1) and cells (3, 1) of a 1D chain with
+    springs k1 inside the cell (tau=0 to tau=1) and k2 between cells (tau=1
+    to tau=0 of the next cell)."""
+    k2 = k1 if k2 is None else k2
+    R = np.array([[-1], [0], [1]])
+    F = np.zeros((3, 2, 2, 1, 1))
+    F[1, 0, 0] = F[1, 1, 1] = k1 + k2
+    F[1, 0, 1] = F[1, 1, 0] = -k1
+    F[2, 1, 0] = F[0, 0, 1] = -k2
+    return F, R
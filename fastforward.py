@@ -0,0 +1,50 @@
+"""Preview a Slide scene from one of its slides on.
+
+    python render.py --slide 12 -qm slide4.py --no_latex_cleanup Centering
+
+Everything before the 12th next_slide call runs as skipped slides: every
+animation jumps to its final state, no frame is drawn or encoded, so the
+preview costs the construct() code plus the slides actually shown. Slide 0 is
+the start of construct. The presentation is written to PREVIEW_DIR instead of
+the manim-slides output folder, a preview never replaces the full slides.
+"""
+import functools
+import sys
+from pathlib import Path
+
+PREVIEW_DIR = "preview"
+
+passed = 0
+
+
+def install(target):
+    """Wrap the Slide methods so every rendered scene starts at slide target."""
+    from manim_slides import Slide
+
+    next_slide, render = Slide.next_slide, Slide.render
+
+    @functools.wraps(next_slide)
+    def counting_next_slide(scene, *args, **kwargs):
+        global passed
+        passed += 1
+        if passed == target:
+            scene.stop_skip_animations()
+        return next_slide(scene, *args, **kwargs)
+
+    @functools.wraps(render)
+    def preview_render(scene, *args, **kwargs):
+        global passed
+        passed = 0
+        scene._output_folder = Path(PREVIEW_DIR)
+        if target > 0:
+            # the slides up to the target, including the first one, are skipped
+            scene.start_skip_animations()
+            next_slide(scene)
+        result = render(scene, *args, **kwargs)
+        if passed < target:
+            print(f"{type(scene).__name__} has only {passed + 1} slides, nothing rendered",
+                  file=sys.stderr)
+        return result
+
+    Slide.next_slide = counting_next_slide
+    Slide.render = preview_render
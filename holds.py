@@ -0,0 +1,92 @@
+"""Encode static holds as two frames instead of one frame per tick.
+
+    python render.py --holds -qm slide4.py --no_latex_cleanup Centering
+
+manim already draws a frozen wait (a wait with no time-based updaters, e.g.
+after self.add) once, and hands the frame to the segment encoder with the
+number of frames it lasts; the encoder then compresses that frame again for
+every tick. With install(), a segment made of one repeated frame gets the
+frame once and a copy at the timestamp of the last tick. The movie lasts as
+long as before, and a wait segment costs two frames to encode and store
+whatever its duration. Concatenation and players follow the timestamps;
+manim-slides' reversal does not (the reverse filter keeps them in input
+order), so reverse_chunk replaces it with one that reverses the time each
+frame is shown. Segments with other frames are encoded as before: a timestamp
+gap among reordered B-frames breaks the mp4 durations.
+"""
+import functools
+
+import numpy as np
+
+
+def reverse_chunk(src_and_dest):
+    """manim_slides.utils.reverse_video_file_in_one_chunk keeping how long each
+    frame is shown: the reverse filter it uses keeps the input timestamps in
+    order, which moves a hold to the other end of the reversed movie."""
+    import av
+
+    src, dest = src_and_dest
+    with av.open(str(src)) as input_container, av.open(str(dest), mode="w") as output_container:
+        input_stream = input_container.streams.video[0]
+        frames = list(input_container.decode(input_stream))
+        # the encoder frame rate: base_rate is guessed from the timestamps,
+        # wrong for a hold
+        rate = input_stream.codec_context.framerate or input_stream.base_rate
+        tick = round(1 / (rate * input_stream.time_base))
+        starts = [frame.pts for frame in frames]
+        # a movie or chunk ends on a single tick, a hold on its closing copy
+        durations = np.diff(starts + [starts[-1] + tick])
+        output_stream = output_container.add_stream(codec_name="libx264", rate=rate)
+        output_stream.width = input_stream.width
+        output_stream.height = input_stream.height
+        output_stream.pix_fmt = input_stream.pix_fmt
+        if (durations != tick).any():
+            # timestamp gaps among reordered B-frames break the mp4 durations
+            output_stream.codec_context.max_b_frames = 0
+        shown = [(frame, start) for frame, start
+                 in zip(frames[::-1], starts[0] + np.r_[0, np.cumsum(durations[::-1])[:-1]])]
+        if durations[0] > tick:
+            # the last packet lasts one tick: a copy at the last tick ends the movie on time
+            shown.append((frames[0].reformat(), starts[0] + durations.sum() - tick))
+        for frame, start in shown:
+            frame.pts, frame.time_base = int(start), input_stream.time_base
+            frame.pict_type = av.video.frame.PictureType.NONE
+            output_container.mux(output_stream.encode(frame))
+        output_container.mux(output_stream.encode())
+
+
+def install():
+    """Wrap the manim segment encoder so still segments are written as two
+    frames, and the manim-slides reversal so it keeps their duration."""
+    from manim.scene.video_segment_encoder import VideoSegmentEncoder
+    import manim_slides.utils
+
+    write_frame, finish = VideoSegmentEncoder.write_frame, VideoSegmentEncoder.finish
+
+    @functools.wraps(write_frame)
+    def holding_write_frame(encoder, pixels, *, repeat=1):
+        hold = getattr(encoder, "_hold", None)
+        if hold is not None:
+            # more frames follow: the hold is encoded one frame per tick
+            encoder._hold = None
+            write_frame(encoder, hold[0], repeat=hold[1])
+        if repeat > 2 and encoder._next_pts == 0:
+            write_frame(encoder, pixels)
+            encoder._hold = (pixels, repeat - 1)
+        else:
+            write_frame(encoder, pixels, repeat=repeat)
+
+    @functools.wraps(finish)
+    def holding_finish(encoder):
+        if getattr(encoder, "_hold", None) is not None and not encoder._closed:
+            pixels, owed = encoder._hold
+            encoder._hold = None
+            # the copy at the last tick sets the segment duration
+            encoder._next_pts += owed - 1
+            write_frame(encoder, pixels)
+        return finish(encoder)
+
+    VideoSegmentEncoder.write_frame = holding_write_frame
+    VideoSegmentEncoder.finish = holding_finish
+    # looked up at call time by reverse_video_file, and pickled by name for its process pool
+    manim_slides.utils.reverse_video_file_in_one_chunk = reverse_chunk
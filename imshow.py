@@ -1,53 +1,193 @@
+import functools
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+import types
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.colors import Normalize
 from manim import TexTemplate
 
+CACHE_DIR = ".imshow_cache"
+CACHE_SIZE = 256 * 2**20  # bytes kept in CACHE_DIR before evicting old images
+
 physics = TexTemplate()
 physics.add_to_preamble(r"\usepackage{physics}")
 
 amsmath = TexTemplate()
 amsmath.add_to_preamble(r"\usepackage{amsmath}")
 
+def value_key(value):
+    """Text standing for value, free of memory addresses: arrays by their
+    bytes (their repr elides the middle), code and functions by their bytecode."""
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return f"array {value.dtype} {value.shape} {digest}"
+    if isinstance(value, types.FunctionType):
+        value = value.__code__
+    if isinstance(value, types.CodeType):
+        return "\n".join([value.co_code.hex(), *(value_key(c) for c in value.co_consts)])
+    return repr(value)
+
+
+def function_key(function):
+    """Source of function plus the closure and global values it reads."""
+    code = function.__code__
+    try:
+        parts = [inspect.getsource(function)]
+    except (OSError, TypeError):
+        parts = [code.co_code.hex()]
+    # nested functions and comprehensions are code objects among the constants
+    parts += [value_key(c) for c in code.co_consts]
+    parts += [value_key(cell.cell_contents) for cell in function.__closure__ or ()]
+    parts += [f"{name}={function.__globals__[name]!r}" for name in code.co_names
+              if isinstance(function.__globals__.get(name), (int, float, complex, str, tuple))]
+    return "\n".join(parts)
+
+
+def evict(cache_dir=CACHE_DIR, max_size=CACHE_SIZE):
+    """Remove the least recently used entries until the cache fits in max_size bytes."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_dir() and not entry.name.startswith("."):
+            size = sum(f.stat().st_size for f in os.scandir(entry.path))
+            entries.append((entry.stat().st_mtime, size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def arrays(filename):
+    """Paths of the field and FFT magnitude arrays saved for filename."""
+    root, _ = os.path.splitext(filename)
+    head, tail = os.path.split(root)
+    return root + ".npy", os.path.join(head, "fft_" + tail + ".npy")
+
+
+def cached(sample):
+    """Serve the arrays of each filename from CACHE_DIR when sample already
+    computed them with the same function source, extent and n_pixels; only the
+    missing fields of a batch are sampled again."""
+    @functools.wraps(sample)
+    def wrapper(filename, function=None, extent=None, n_pixels=None):
+        filenames = [filename] if isinstance(filename, str) else list(filename)
+        functions = [function] if callable(function) else list(function)
+        common = [inspect.getsource(sample), repr(list(extent)), repr(n_pixels)]
+        missing = []
+        for filename, function in zip(filenames, functions):
+            key = hashlib.sha256("\n".join(common + [function_key(function)]).encode())
+            entry = os.path.join(CACHE_DIR, key.hexdigest())
+            field, fft = arrays(filename)
+            if os.path.isdir(entry):
+                shutil.copyfile(os.path.join(entry, "field.npy"), field)
+                shutil.copyfile(os.path.join(entry, "fft.npy"), fft)
+                os.utime(entry)
+            else:
+                missing.append((filename, function, entry))
+        if not missing:
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        filenames, functions, entries = zip(*missing)
+        sample(list(filenames), list(functions), extent=extent, n_pixels=n_pixels)
+        for filename, entry in zip(filenames, entries):
+            field, fft = arrays(filename)
+            tmp = tempfile.mkdtemp(prefix=".", dir=CACHE_DIR)
+            shutil.copyfile(field, os.path.join(tmp, "field.npy"))
+            shutil.copyfile(fft, os.path.join(tmp, "fft.npy"))
+            try:
+                os.rename(tmp, entry)
+            except OSError:  # built concurrently by another scene
+                shutil.rmtree(tmp)
+        evict()
+    return wrapper
+
+
+def field_axes(extent, n_pixels):
+    """Pixel coordinates spanning extent, as a row of x and a column of y."""
+    ny = round(n_pixels*(extent[3]-extent[2])/(extent[1]-extent[0]))
+    x = np.linspace(extent[0], extent[1], n_pixels, dtype=np.float32)
+    y = np.linspace(extent[2], extent[3], ny, dtype=np.float32)[:, None]
+    return x, y
+
+
+def edge_fade(x, y, extent):
+    """Alpha fading towards the border, arctan(2 * distance to nearest edge) / pi."""
+    alpha = np.minimum(np.minimum(x - extent[0], extent[1] - x),
+                       np.minimum(y - extent[2], extent[3] - y))
+    alpha *= 2
+    np.arctan(alpha, out=alpha)
+    alpha /= np.pi
+    return alpha
+
+
+def colormap_rgba(values, mapp, alpha, vmin=None, vmax=None):
+    """uint8 RGBA image of values through the colormap lookup table of mapp,
+    clipping outside [vmin, vmax] (default: the range of values)."""
+    cmap = plt.get_cmap(mapp)
+    lut = (cmap(np.arange(cmap.N)) * 255).astype(np.uint8)
+    vmin = np.min(values) if vmin is None else vmin
+    vmax = np.max(values) if vmax is None else vmax
+    scaled = values - np.float32(vmin)
+    scaled *= cmap.N / (vmax - vmin) if vmax > vmin else 0
+    np.clip(scaled, 0, cmap.N - 1, out=scaled)
+    rgba = lut[scaled.astype(np.min_scalar_type(cmap.N - 1))]
+    rgba[..., 3] = alpha * 255
+    return rgba
+
+
+def spectrum(Z):
+    """|fftshift(fft2(Z))| of a real field, built from its half spectrum."""
+    ny, nx = Z.shape
+    half = np.abs(np.fft.rfft2(Z))
+    full = np.empty((ny, nx), dtype=half.dtype)
+    h = half.shape[1]
+    full[:, :h] = half
+    # |F(-k)| = |F(k)| for a real field
+    full[:, h:] = np.roll(half[::-1], 1, axis=0)[:, nx - np.arange(h, nx)]
+    return np.fft.fftshift(full)
+
+
+@cached
+def sample_fields(filename, function=None, extent=None, n_pixels=None):
+    """Save function sampled over extent (float32, y rows from the bottom) and
+    the magnitude of its windowed FFT next to filename, see arrays."""
+    filenames = [filename] if isinstance(filename, str) else filename
+    functions = [function] if callable(function) else function
+    x, y = field_axes(extent, n_pixels)
+    window_x = np.hanning(x.size).astype(np.float32)
+    window_y = np.hanning(y.size).astype(np.float32)[:, None]
+    for filename, function in zip(filenames, functions):
+        field, fft = arrays(filename)
+        Z = np.empty((y.size, x.size), dtype=np.float32)
+        Z[...] = function(x, y)
+        np.save(field, Z)
+        Z *= window_x
+        Z *= window_y
+        np.save(fft, spectrum(Z).astype(np.float32))
+
+
+def field_image(filename, extent, mapp='viridis', vmin=None, vmax=None, fft=False):
+    """uint8 RGBA image, bottom row first, of the field (or FFT magnitude)
+    saved for filename through the colormap mapp and faded towards the edges
+    of extent. Reads the memory-mapped array, no resampling."""
+    values = np.load(arrays(filename)[fft], mmap_mode="r")
+    x, y = field_axes(extent, values.shape[1])
+    return colormap_rgba(values, mapp, edge_fade(x, y, extent), vmin=vmin, vmax=vmax)
+
+
 def construct_imshow(filename, function=None, extent=None, n_pixels=None, mapp='viridis'):
-    x_vals = np.linspace(extent[0], extent[1], n_pixels)
-    y_vals = np.linspace(extent[2], extent[3],
-                         round(n_pixels*(extent[3]-extent[2])/(extent[1]-extent[0])))
-    X, Y = np.meshgrid(x_vals, y_vals)
-    Z = function(X, Y)
-
-    norm = Normalize(vmin=np.min(Z), vmax=np.max(Z))
-    Z_normalized = norm(Z)
-
-    # Get RGB using colormap
-    colored_image = plt.get_cmap(mapp)(Z_normalized)
-    print(X.shape)
-
-    # Create a fading mask based on distance from center
-    distances = np.zeros((4, y_vals.size, x_vals.size))
-    distances[0,:,:] = np.abs(X-extent[0])
-    distances[1,:,:] = np.abs(Y-extent[2])
-    distances[2,:,:] = np.abs(extent[1]-X)
-    distances[3,:,:] = np.abs(extent[3]-Y)
-    alpha_mask = np.arctan(np.min(distances, axis=0) * 2) / np.pi
-    # Apply mask to alpha channel
-    colored_image[..., 3] = alpha_mask  # Set alpha channel
-
-
-    window_2d = np.outer(np.hanning(x_vals.size), np.hanning(y_vals.size))
-    Z *= window_2d
-    # Compute the 2D Fourier Transform
-    # Z -= np.mean(Z)  # Remove the DC component
-    fft_result = np.fft.fft2(Z)  # Perform the 2D FFT
-    fft_shifted = np.fft.fftshift(fft_result)  # Shift the zero frequency to the center
-    # fft_result -= np.mean(fft_result)
-    fftZ = np.abs(fft_shifted)  # Compute the magnitude of the FFT
-    print(np.min(fftZ), np.max(fftZ))
-    norm = Normalize(vmin=np.min(fftZ), vmax=np.max(fftZ))
-    Z_normalized = norm(fftZ)
-    fft_image = plt.get_cmap(mapp)(fftZ)
-    fft_image[..., 3] = alpha_mask  # Set alpha channel
-
-
-    plt.imsave("fft_"+filename, fft_image, cmap=mapp, origin='lower')
-    plt.imsave(filename, colored_image, cmap=mapp, origin='lower')
\ No newline at end of file
+    """Save function sampled over extent as filename and the magnitude of its
+    windowed FFT as "fft_"+filename, both faded towards the edges. filename and
+    function may be lists, rendering several images of the same grid at once.
+    The samples are cached without the colormap, so changing mapp only recolors."""
+    filenames = [filename] if isinstance(filename, str) else filename
+    sample_fields(filename, function, extent=extent, n_pixels=n_pixels)
+    for filename in filenames:
+        plt.imsave(filename, field_image(filename, extent, mapp), origin='lower')
+        # raw magnitudes, saturating above 1
+        plt.imsave("fft_"+filename, field_image(filename, extent, mapp, vmin=0, vmax=1, fft=True),
+                   origin='lower')
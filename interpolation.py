@@ -0,0 +1,56 @@
+"""Fourier interpolation of supercell force constants.
+
+    F_ws, L = center(F, R, cell, tau, supercell=(4, 4, 4))
+    omega, modes = dynmat.phonons(F_ws, L, masses, q)     # any q, any batch size
+
+The force constants of an N1xN2xN3 supercell only fix D(q) on the commensurate
+q-grid. Between grid points the result depends on which periodic replica
+R + N T of each (tau, tau', R) is used. center keeps, for every triple, the
+replicas at the shortest distance |R + N T + tau' - tau| (the Wigner-Seitz
+rule) with weight 1/n when n of them tie, and folds the weights into a table
+of centered force constants over the distinct lattice vectors L. D(q) for a
+q-batch is then a single product of that table with exp(2 pi i q.L).
+"""
+import itertools
+
+import numpy as np
+
+
+def shortest_replicas(R, cell, tau, supercell, search=2, tol=1e-6):
+    """Replica offsets and weights of the shortest (tau, tau', R + N T).
+
+    Returns mask (nat, nat, nR, nT) of the kept replicas, weights of the same
+    shape (1/n on the kept ones) and the offsets T (nT, d). R and tau are in
+    crystal coordinates of cell (d, d), supercell is (N1, ..., Nd). search
+    bounds |T|; it must reach past the Wigner-Seitz cell of the supercell.
+    """
+    R = np.asarray(R, dtype=float)
+    tau = np.asarray(tau, dtype=float)
+    N = np.asarray(supercell)
+    T = np.array(list(itertools.product(range(-search, search + 1), repeat=len(N))))
+    replicas = R[:, None] + (T * N)[None]                         # (nR, nT, d)
+    nat = len(tau)
+    mask = np.empty((nat, nat) + replicas.shape[:2], dtype=bool)
+    for a in range(nat):
+        # one atom at a time keeps the (nat, nR, nT, d) temporaries small
+        vectors = (replicas[None] + (tau - tau[a])[:, None, None]) @ cell
+        distance = np.linalg.norm(vectors, axis=-1)
+        shortest = distance.min(axis=-1, keepdims=True)
+        mask[a] = distance <= shortest * (1 + tol) + tol
+    weights = mask / mask.sum(axis=-1, keepdims=True)
+    return mask, weights, T
+
+
+def center(F, R, cell, tau, supercell, search=2, tol=1e-6):
+    """Centered force constants F_ws (nL, nat, nat, d, d) on the lattice
+    vectors L (nL, d), ready for dynmat.dynamical_matrix and dynmat.phonons."""
+    F = np.asarray(F)
+    R = np.asarray(R) % np.asarray(supercell)
+    mask, weights, T = shortest_replicas(R, cell, tau, supercell, search, tol)
+    a, b, r, t = np.nonzero(mask)
+    vectors = R[r] + T[t] * np.asarray(supercell)
+    L, index = np.unique(vectors, axis=0, return_inverse=True)
+    nat, d = F.shape[1], F.shape[-1]
+    F_ws = np.zeros((len(L), nat, nat, d, d), dtype=F.dtype)
+    np.add.at(F_ws, (index.ravel(), a, b), weights[a, b, r, t][:, None, None] * F[r, a, b])
+    return F_ws, L
@@ -0,0 +1,53 @@
+"""Lattice thermal conductivity in the relaxation time approximation.
+
+    T = np.linspace(10, 1000, 300)
+    gamma = linewidth.linewidths(Vqq, omega**2, modes, sigma)
+    k = kappa(omega, velocities, gamma, T, volume)     # (300, 3, 3) W/m/K
+
+    kappa_ab(T) = 1 / (N V) sum_qs C_qs(T) v_qs,a v_qs,b tau_qs,  tau_qs = 1 / (2 Gamma_qs)
+
+with omega in rad/s, v in m/s and V the unit cell volume in m^3. The
+linewidths are taken as linewidth.linewidths returns them, for E := omega^2
+in (rad/s)^2, and converted to angular frequency, Gamma_qs = Gamma_E /
+(2 omega). The mode sums do not depend on T, so the whole temperature array
+is one broadcast of the heat capacities and one matrix product.
+"""
+import numpy as np
+
+HBAR = 1.054571817e-34  # J s
+KB = 1.380649e-23       # J/K
+
+
+def _x(omega, T):
+    """hbar omega / k_B T (nT, ...)."""
+    T = np.asarray(T, dtype=float).reshape((-1,) + (1,) * np.ndim(omega))
+    return HBAR * np.asarray(omega)[None] / (KB * T)
+
+
+def occupations(omega, T):
+    """Bose occupations (nT, ...) of the frequencies omega at the temperatures T."""
+    return 1 / np.expm1(_x(omega, T))
+
+
+def heat_capacities(omega, T):
+    """Mode heat capacities (nT, ...) in J/K, k_B x^2 n (n + 1)."""
+    x = _x(omega, T)
+    n = 1 / np.expm1(x)
+    return KB * x**2 * n * (n + 1)
+
+
+def kappa(omega, velocities, gamma, T, volume, cutoff=1e-6):
+    """kappa (nT, 3, 3) from frequencies and E = omega^2 linewidths (nq, nb),
+    group velocities (nq, nb, 3) and temperatures T (nT,). Modes with omega
+    or Gamma below cutoff times their largest value (the acoustic modes at
+    Gamma, whose omega is eigh noise) are left out."""
+    n_cells = len(omega)
+    omega, gamma = np.ravel(omega), np.ravel(gamma)
+    velocities = np.reshape(velocities, (-1, 3))
+    keep = (omega > cutoff * omega.max()) & (gamma > cutoff * gamma.max())
+    # tau = 1 / (2 Gamma_omega) with Gamma_omega = Gamma_E / (2 omega)
+    tau = omega[keep] / gamma[keep]
+    # (modes, 9): the temperature-independent part of every mode
+    transport = (tau[:, None, None] * velocities[keep, :, None] * velocities[keep, None, :]).reshape(-1, 9)
+    C = heat_capacities(omega[keep], T)                                   # (nT, modes)
+    return (C @ transport).reshape(-1, 3, 3) / (n_cells * volume)
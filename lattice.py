@@ -0,0 +1,140 @@
+"""Array-backed atom lattices.
+
+    atoms = AtomLattice([axes.n2p(x) for x in xs], radii=0.1, colors=[RED, BLUE] * n)
+    self.play(atoms.animate.displace(RIGHT * 0.3, slice(0, None, 4)))
+    self.play(atoms.animate.displace(field))   # one (n, 3) displacement per atom
+    springs = SpringNetwork(atoms.positions, pairs, width=lambda r: 50 * np.exp(-r))
+    springs.add_updater(lambda m: m.set_displacement(tracker.get_value() * field))
+
+The atoms of one color are the subpaths of a single filled VMobject, so a
+lattice is a handful of mobjects whatever its size, and moving atoms is one
+NumPy operation on the points instead of one mobject per atom.
+"""
+import numpy as np
+from manim import *
+
+# unit circle with the point layout of a Dot, copied for every atom
+CIRCLE = Dot(ORIGIN, radius=1).points
+
+
+class AtomLattice(VGroup):
+    def __init__(self, positions, radii=DEFAULT_DOT_RADIUS, colors=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        positions = np.asarray(positions, dtype=float).reshape(-1, np.shape(positions)[-1])
+        if positions.shape[1] == 2:
+            positions = np.column_stack([positions, np.zeros(len(positions))])
+        n = len(positions)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), (n,))
+        if isinstance(colors, (str, ManimColor)):
+            colors = [colors] * n
+        self.colors = np.array([ManimColor(color).to_hex() for color in colors])
+        palette, group = np.unique(self.colors, return_inverse=True)
+        # members[g]: indices of the atoms drawn by submobject g, in lattice order
+        self.members = [np.flatnonzero(group == g) for g in range(len(palette))]
+        for color, members in zip(palette, self.members):
+            path = VMobject(fill_color=color, fill_opacity=1, stroke_width=0)
+            path.set_points(self._circles(positions[members], radii[members]))
+            self.add(path)
+
+    @staticmethod
+    def _circles(positions, radii):
+        return (CIRCLE[None] * radii[:, None, None] + positions[:, None]).reshape(-1, 3)
+
+    @property
+    def n_atoms(self):
+        return len(self.colors)
+
+    @property
+    def positions(self):
+        """(n, 3) atom centers, read from the points so they follow shift, scale and animate."""
+        positions = np.empty((self.n_atoms, 3))
+        for path, members in zip(self.submobjects, self.members):
+            positions[members] = path.points.reshape(len(members), -1, 3).mean(axis=1)
+        return positions
+
+    @property
+    def radii(self):
+        positions = self.positions
+        radii = np.empty(self.n_atoms)
+        for path, members in zip(self.submobjects, self.members):
+            first = path.points.reshape(len(members), -1, 3)[:, 0]
+            radii[members] = np.linalg.norm(first - positions[members], axis=1)
+        return radii
+
+    def _field(self, delta, where):
+        """Per-atom (n, 3) displacement from a vector, a field over all atoms or
+        a field over the selected ones; atoms outside where stay put."""
+        selected = np.zeros(self.n_atoms, dtype=bool)
+        selected[slice(None) if where is None else where] = True
+        delta = np.asarray(delta, dtype=float)
+        if delta.ndim == 2 and len(delta) == self.n_atoms:
+            delta = delta[selected]
+        field = np.zeros((self.n_atoms, 3))
+        field[selected] = delta
+        return field
+
+    def displace(self, delta, where=None):
+        """Move the atoms selected by where (index, slice or boolean mask, default
+        all) by delta: one vector, or one row per atom."""
+        field = self._field(delta, where)
+        for path, members in zip(self.submobjects, self.members):
+            points = path.points.reshape(len(members), -1, 3)
+            path.points = (points + field[members, None]).reshape(-1, 3)
+        return self
+
+    def set_positions(self, positions, where=None):
+        """Move the atoms selected by where to positions (all atoms or the selection)."""
+        positions = np.asarray(positions, dtype=float)
+        current = self.positions
+        if where is not None and len(positions) != self.n_atoms:
+            current = current[where]
+        return self.displace(positions - current, where)
+
+    def atom(self, index):
+        """A Dot copy of one atom, for labels, arrows and separate animations."""
+        index %= self.n_atoms
+        for path, members in zip(self.submobjects, self.members):
+            slot = np.searchsorted(members, index)
+            if slot < len(members) and members[slot] == index:
+                points = path.points.reshape(len(members), -1, 3)[slot]
+                center = points.mean(axis=0)
+                radius = np.linalg.norm(points[0] - center)
+                return Dot(center, radius=radius, color=path.get_fill_color(),
+                           fill_opacity=path.get_fill_opacity())
+        raise IndexError(index)
+
+    def dots(self):
+        """The lattice as a VGroup of Dots, for per-atom intros and transforms
+        between lattices of different sizes."""
+        return VGroup(*[self.atom(i) for i in range(self.n_atoms)])
+
+
+class SpringNetwork(VMobject):
+    """Springs between pairs of sites, drawn as filled bars whose width is
+    width(rest length) in stroke-width units, so one VMobject holds springs of
+    any thickness. set_displacement moves every endpoint in one step."""
+
+    def __init__(self, positions, pairs, width=lambda r: np.full_like(r, DEFAULT_STROKE_WIDTH), color=YELLOW, **kwargs):
+        super().__init__(fill_color=color, fill_opacity=1, stroke_width=0, **kwargs)
+        self.rest = np.array(positions, dtype=float)
+        self.pairs = np.asarray(pairs, dtype=int).reshape(-1, 2)
+        start, end = self.rest[self.pairs[:, 0]], self.rest[self.pairs[:, 1]]
+        # stroke widths are hundredths of a frame unit
+        self.half_widths = 0.005 * width(np.linalg.norm(end - start, axis=1))
+        self.set_displacement(0)
+
+    def set_displacement(self, displacement):
+        """Place the springs on the rest sites shifted by displacement, one
+        vector or one row per site."""
+        sites = self.rest + displacement
+        start, end = sites[self.pairs[:, 0]], sites[self.pairs[:, 1]]
+        direction = end - start
+        direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+        normal = np.column_stack([-direction[:, 1], direction[:, 0], np.zeros(len(direction))])
+        normal *= self.half_widths[:, None]
+        corners = np.stack([start + normal, end + normal, end - normal, start - normal], axis=1)
+        # each side a straight cubic from one corner to the next
+        t = np.linspace(0, 1, 4)[None, None, :, None]
+        sides = corners[:, :, None] * (1 - t) + np.roll(corners, -1, axis=1)[:, :, None] * t
+        self.points = sides.reshape(-1, 3)
+        return self
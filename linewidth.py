@@ -0,0 +1,49 @@
+"""Second-order linewidths of the phonons scattered by a defect.
+
+    Vqq = double_fourier.transform(V, supercell, "Vqq.npy")
+    omega, modes = dynmat.phonons(F_ws, L, masses, dynmat.q_grid(*supercell))
+    gamma = linewidths(Vqq, omega**2, modes, sigma=1e-3)
+
+computes, as in PerturbationTheory (E := omega^2),
+
+    Gamma_qs = sum_{q's'} |<q's'| V(q', -q) |qs>|^2 delta(E_qs - E_q's')
+
+for every mode of the grid. The matrix elements of a chunk of q rows against
+all (q', s') are two batched matmuls over the eigenvectors, and the smeared
+delta is broadcast over the same block, so the only loop is over chunks.
+"""
+import numpy as np
+
+MEMORY = 256 * 2**20  # bytes of complex matrix elements held at once
+
+
+def gaussian(x, sigma):
+    return np.exp(-0.5 * (x / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+
+
+def lorentzian(x, sigma):
+    return sigma / np.pi / (x ** 2 + sigma ** 2)
+
+
+SMEARINGS = {"gaussian": gaussian, "lorentzian": lorentzian}
+
+
+def linewidths(Vqq, energies, modes, sigma, smearing="gaussian", chunk=None):
+    """Gamma (nq, nb) from V(q, q') (nq, nq, nb, nb), indexed like
+    double_fourier.transform and possibly memory-mapped, the energies
+    (nq, nb) and eigenvectors (nq, nb, nb, one per column) of the grid.
+    chunk is the number of q rows per block, by default sized to MEMORY."""
+    delta = SMEARINGS[smearing]
+    nq, nb = energies.shape
+    chunk = chunk or max(1, MEMORY // (16 * nq * nb * nb * 2))
+    gamma = np.empty((nq, nb))
+    for start in range(0, nq, chunk):
+        rows = slice(start, start + chunk)
+        # V(q', -q) = V(q, q')^H for a real symmetric V(R, R'), so |<q's'|V(q',-q)|qs>|
+        # is |<qs|V(q, q')|q's'>| and only the rows of this chunk are read
+        V = np.asarray(Vqq[rows])                                 # (c, q', i, j)
+        left = np.matmul(modes[rows].conj().swapaxes(-1, -2)[:, None], V)
+        elements = np.abs(np.matmul(left, modes[None])) ** 2      # (c, q', s, s')
+        weights = delta(energies[rows, None, :, None] - energies[None, :, None, :], sigma)
+        gamma[rows] = np.einsum("cpst,cpst->cs", elements, weights)
+    return gamma
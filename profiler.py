@@ -0,0 +1,181 @@
+"""Per-call render profile of Slide scenes.
+
+    python render.py --profile -qm slide4.py Centering
+    python profiler.py --top 20
+
+Every outermost Slide.play/wait/next_slide call is recorded with its wall
+time, the frames it wrote, the number of mobjects in the scene, the time
+spent in updaters and the time spent compiling TeX since the previous call
+(Tex/MathTex are built in construct, before the call that shows them).
+Each scene writes profile/<Scene>.json.
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import sys
+import time
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profile")
+
+
+class Recorder:
+    def __init__(self, scene):
+        self.scene = scene
+        self.calls = []
+        self.slide = 0
+        self.depth = 0
+        self.frames = 0
+        self.updaters = 0.0
+        self.tex = 0.0
+
+    def record(self, kind, method, scene, *args, **kwargs):
+        if self.depth:
+            return method(scene, *args, **kwargs)
+        caller = sys._getframe(2)
+        frames, updaters, tex = self.frames, self.updaters, self.tex
+        self.tex = 0.0
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            return method(scene, *args, **kwargs)
+        finally:
+            wall = time.perf_counter() - start
+            self.depth -= 1
+            self.calls.append({
+                "index": len(self.calls),
+                "kind": kind,
+                "slide": self.slide,
+                "line": f"{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno}",
+                "description": describe(kind, args, kwargs),
+                "wall": wall,
+                "frames": self.frames - frames,
+                "mobjects": len(scene.get_mobject_family_members()),
+                "updaters": self.updaters - updaters,
+                "tex": tex + self.tex,
+            })
+            if kind == "next_slide":
+                self.slide += 1
+
+    def save(self, wall):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        name = type(self.scene).__name__
+        with open(os.path.join(PROFILE_DIR, name + ".json"), "w") as f:
+            json.dump({
+                "scene": name,
+                "wall": wall,
+                "frames": self.frames,
+                "tex": sum(call["tex"] for call in self.calls) + self.tex,
+                "calls": self.calls,
+            }, f, indent=1)
+
+
+def describe(kind, args, kwargs):
+    if kind == "wait":
+        return f"wait({args[0] if args else kwargs.get('duration', 1.0)})"
+    if kind == "next_slide":
+        options = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+        return f"next_slide({options})"
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            names.append(f"[{len(arg)} x {type(arg[0]).__name__ if arg else ''}]")
+        elif type(arg).__name__ == "_AnimationBuilder":
+            names.append(f"{type(arg.mobject).__name__}.animate")
+        else:
+            names.append(str(arg))
+    return ", ".join(names)
+
+
+current = None
+
+
+def install():
+    """Wrap the Slide and renderer methods so every rendered scene is profiled."""
+    from manim import Scene
+    from manim.renderer.cairo_renderer import CairoRenderer
+    import manim.mobject.text.tex_mobject as tex_mobject
+    from manim_slides import Slide
+
+    def wrap_call(kind, method):
+        @functools.wraps(method)
+        def wrapper(scene, *args, **kwargs):
+            if current is None:
+                return method(scene, *args, **kwargs)
+            return current.record(kind, method, scene, *args, **kwargs)
+        return wrapper
+
+    def wrap_timer(attribute, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if current is not None:
+                    setattr(current, attribute,
+                            getattr(current, attribute) + time.perf_counter() - start)
+        return wrapper
+
+    add_frame = CairoRenderer.add_frame
+
+    @functools.wraps(add_frame)
+    def count_frames(renderer, frame, num_frames=1):
+        if current is not None and not renderer.skip_animations:
+            current.frames += num_frames
+        return add_frame(renderer, frame, num_frames)
+
+    render = Slide.render
+
+    @functools.wraps(render)
+    def profiled_render(scene, *args, **kwargs):
+        global current
+        current = Recorder(scene)
+        start = time.perf_counter()
+        try:
+            return render(scene, *args, **kwargs)
+        finally:
+            current.save(time.perf_counter() - start)
+            current = None
+
+    Slide.play = wrap_call("play", Slide.play)
+    Slide.wait = wrap_call("wait", Slide.wait)
+    Slide.next_slide = wrap_call("next_slide", Slide.next_slide)
+    Slide.render = profiled_render
+    Scene.update_mobjects = wrap_timer("updaters", Scene.update_mobjects)
+    tex_mobject.tex_to_svg_file = wrap_timer("tex", tex_mobject.tex_to_svg_file)
+    CairoRenderer.add_frame = count_frames
+
+
+def report(paths, top=15):
+    profiles = []
+    for path in paths:
+        with open(path) as f:
+            profiles.append(json.load(f))
+    print(f"{'scene':<20} {'wall':>8} {'frames':>7} {'tex':>7}")
+    for profile in sorted(profiles, key=lambda p: -p["wall"]):
+        print(f"{profile['scene']:<20} {profile['wall']:7.1f}s {profile['frames']:7d} {profile['tex']:6.1f}s")
+
+    calls = [dict(call, scene=profile["scene"]) for profile in profiles for call in profile["calls"]]
+    print(f"\ntop {top} calls")
+    print(f"{'wall':>8} {'frames':>6} {'mobj':>5} {'upd':>6} {'tex':>6}  where")
+    for call in sorted(calls, key=lambda c: -c["wall"])[:top]:
+        print(f"{call['wall']:7.2f}s {call['frames']:6d} {call['mobjects']:5d} "
+              f"{call['updaters']:5.2f}s {call['tex']:5.2f}s  "
+              f"{call['scene']} slide {call['slide']} {call['line']}  {call['description'][:60]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotspot report of the scene profiles.")
+    parser.add_argument("profiles", nargs="*", default=sorted(glob.glob(os.path.join(PROFILE_DIR, "*.json"))))
+    parser.add_argument("-n", "--top", type=int, default=15)
+    args = parser.parse_args()
+    if not args.profiles:
+        parser.error(f"no profiles in {PROFILE_DIR}/, render with python render.py --profile")
+    report(args.profiles, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
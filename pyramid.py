@@ -0,0 +1,121 @@
+"""Tiled multi-resolution images for camera zooms.
+
+    s0_img = TiledImage("bands01.png", self.camera.frame).scale(0.4).shift(DOWN)
+
+The image is cut once into a pyramid of TILE x TILE tiles, level 0 at full
+resolution and every next level at half of it, in CACHE_DIR. On every frame
+only the tiles of the level matching the camera's pixel density that overlap
+the camera frame are shown. Tiles are decoded on first use and the last
+CACHE_TILES of them kept, so a zoom resamples a few small tiles instead of
+the whole image, and large source images cost little memory.
+"""
+import functools
+import hashlib
+import math
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from manim import *
+from PIL import Image
+
+CACHE_DIR = ".pyramid_cache"
+TILE = 512
+CACHE_TILES = 64
+
+
+def build_pyramid(path, cache_dir=CACHE_DIR, tile=TILE):
+    """Directory with the tiles <level>_<row>_<col>.png of path, built once
+    per image content, and its number of levels."""
+    with open(path, "rb") as f:
+        entry = os.path.join(cache_dir, hashlib.sha256(f.read()).hexdigest()[:32] + f"_{tile}")
+    if not os.path.isdir(entry):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp")
+        image = Image.open(path).convert("RGBA")
+        level = 0
+        while True:
+            for top in range(0, image.height, tile):
+                for left in range(0, image.width, tile):
+                    image.crop((left, top, min(left + tile, image.width), min(top + tile, image.height))
+                               ).save(os.path.join(tmp, f"{level}_{top // tile}_{left // tile}.png"))
+            if max(image.size) <= tile:
+                break
+            image = image.reduce(2)
+            level += 1
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # another render built it first
+            shutil.rmtree(tmp, ignore_errors=True)
+    return entry, 1 + max(int(name.split("_")[0]) for name in os.listdir(entry))
+
+
+@functools.lru_cache(maxsize=CACHE_TILES)
+def load_tile(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGBA"))
+
+
+class TiledImage(Group):
+    def __init__(self, path, frame, scale_to_resolution=1080, tile=TILE, **kwargs):
+        super().__init__(**kwargs)
+        self.entry, self.levels = build_pyramid(path, tile=tile)
+        with Image.open(path) as image:
+            self.pixels = image.size
+        self.tile = tile
+        self.frame = frame
+        # invisible box carrying the position and size of the image, sized like an ImageMobject
+        unit = config["frame_height"] / scale_to_resolution
+        self.outline = Rectangle(width=self.pixels[0] * unit, height=self.pixels[1] * unit,
+                                 stroke_width=0, fill_opacity=0)
+        self.add(self.outline)
+        self.shown = None
+        self.tiles = {}
+        self.update_tiles()
+        self.add_updater(lambda m: m.update_tiles())
+
+    def level_size(self, level):
+        """Pixel (width, height) of a level, as Image.reduce rounds them."""
+        width, height = self.pixels
+        for _ in range(level):
+            width, height = math.ceil(width / 2), math.ceil(height / 2)
+        return width, height
+
+    def update_tiles(self):
+        left, bottom = self.outline.get_corner(DL)[:2]
+        right, top = self.outline.get_corner(UR)[:2]
+        width, height = right - left, top - bottom
+        center, fw, fh = self.frame.get_center(), self.frame.width, self.frame.height
+        # visible part of the image, as fractions from its top left corner
+        u0 = max(0.0, (center[0] - fw / 2 - left) / width)
+        u1 = min(1.0, (center[0] + fw / 2 - left) / width)
+        v0 = max(0.0, (top - center[1] - fh / 2) / height)
+        v1 = min(1.0, (top - center[1] + fh / 2) / height)
+        # coarsest level with at least one image pixel per screen pixel
+        density = config["pixel_width"] / fw * width
+        level = int(np.clip(math.floor(math.log2(max(self.pixels[0] / density, 1))), 0, self.levels - 1))
+        lw, lh = self.level_size(level)
+        tiles = ()
+        if u1 > u0 and v1 > v0:
+            rows = range(int(v0 * lh) // self.tile, math.ceil(v1 * lh / self.tile))
+            cols = range(int(u0 * lw) // self.tile, math.ceil(u1 * lw / self.tile))
+            tiles = tuple((level, r, c) for r in rows for c in cols)
+        key = (tiles, left, top, width, height)
+        if key == self.shown:
+            return self
+        self.shown = key
+        shown = {}
+        for level, row, col in tiles:
+            image = self.tiles.get((level, row, col))
+            if image is None:
+                image = ImageMobject(load_tile(os.path.join(self.entry, f"{level}_{row}_{col}.png")))
+            x0, y0 = col * self.tile / lw, row * self.tile / lh
+            x1, y1 = min((col + 1) * self.tile, lw) / lw, min((row + 1) * self.tile, lh) / lh
+            image.stretch_to_fit_width((x1 - x0) * width).stretch_to_fit_height((y1 - y0) * height)
+            image.move_to([left + (x0 + x1) / 2 * width, top - (y0 + y1) / 2 * height, 0])
+            shown[level, row, col] = image
+        self.tiles = shown
+        self.submobjects = [self.outline, *shown.values()]
+        return self
@@ -0,0 +1,62 @@
+"""Run manim on a slide with optional instrumentation of the Slide methods.
+
+    python render.py --profile -qm slide4.py --no_latex_cleanup Centering
+    python render.py --slide 12 -qm slide4.py --no_latex_cleanup Centering
+    python render.py --holds -qm slide4.py --no_latex_cleanup Centering
+    python render.py --output bench/slides -qm slide4.py --no_latex_cleanup Centering
+
+Everything after the render.py options is passed to manim unchanged.
+"""
+import argparse
+import functools
+import sys
+from pathlib import Path
+
+
+def redirect(folder):
+    """Wrap Slide.render so every rendered scene writes its presentation to folder."""
+    from manim_slides import Slide
+
+    render = Slide.render
+
+    @functools.wraps(render)
+    def redirected_render(scene, *args, **kwargs):
+        scene._output_folder = Path(folder)
+        return render(scene, *args, **kwargs)
+
+    Slide.render = redirected_render
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", action="store_true",
+                        help="write profile/<Scene>.json, see profiler.py")
+    parser.add_argument("--holds", action="store_true",
+                        help="encode frozen waits as two frames, see holds.py")
+    parser.add_argument("--slide", type=int, default=None, metavar="N",
+                        help="skip to slide N (after the N-th next_slide) and render from there "
+                             "into preview/, see fastforward.py")
+    parser.add_argument("--output", default=None, metavar="DIR",
+                        help="write the presentation to DIR instead of the manim-slides folder")
+    args, manim_args = parser.parse_known_args(argv)
+
+    if args.profile:
+        import profiler
+        profiler.install()
+    if args.holds:
+        import holds
+        holds.install()
+    if args.slide is not None:
+        # after the profiler, which then does not record the opening skipped slide
+        import fastforward
+        fastforward.install(args.slide)
+    if args.output is not None:
+        # wraps the preview render, which then still writes to preview/
+        redirect(args.output)
+
+    from manim.__main__ import main as manim_main
+    return manim_main(args=manim_args, prog_name="manim")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+# scene list, also read by build.py (python build.py --jobs N renders it in parallel)
 m="manim -qm"
 
 $m slide0.py --no_latex_cleanup Introduction
@@ -1,8 +1,7 @@
 from manim_slides import Slide
 from manim import *
-
-amsmath = TexTemplate()
-amsmath.add_to_preamble(r"\usepackage{amsmath}")
+from imshow import amsmath
+from lattice import AtomLattice, SpringNetwork
 
 class Introduction(Slide):
     def construct(self):
@@ -55,30 +54,15 @@ class Phonon(Slide):
         self.next_slide()
 
 
-        atoms = VGroup()
         spacing = 1.5
-
-
-        for i in range(-2,3):
-            for j in range(-1,2):
-                atom = Dot(radius=0.2, color=BLUE).shift(i*RIGHT*spacing + j*UP*spacing)
-                atoms.add(atom)
-
-        def set_springs(origin, atoms, shift):
-            springs = VGroup()
-            index = 0
-            for i in range(-2,3):
-                for j in range(-1,2):
-                    if (i,j) != (0,0):
-                        spring = Line(start=origin+shift, end=atoms[index].get_center(), color=YELLOW, stroke_width=50*np.exp(-np.linalg.norm(atoms[index].get_center()-origin)**1.4))
-                        springs.add(spring)
-                    index += 1
-            springs.set_z_index(-1)
-            return springs
-
-        atoms[7].set_color(RED)
+        sites = [(i*RIGHT + j*UP)*spacing for i in range(-2,3) for j in range(-1,2)]
+        center = 7
+        atoms = AtomLattice(sites, radii=0.2,
+            colors=[RED if k == center else BLUE for k in range(len(sites))])
         atoms.to_corner(DOWN+LEFT, buff=0.5)
-        springs = set_springs(atoms[7].get_center(), atoms, 0)
+        rest = atoms.positions
+        springs = SpringNetwork(rest, [(center, k) for k in range(len(sites)) if k != center],
+            width=lambda r: 50*np.exp(-r**1.4), color=YELLOW).set_z_index(-1)
 
         self.play(Create(atoms))
         self.play(Create(springs))
@@ -90,28 +74,25 @@ class Phonon(Slide):
         self.play(Write(label_N))
         # self.next_slide(auto_next=True)
 
-        atom0 = atoms[7].copy()
-        springs0 = springs.copy()
-        shift = (UP+2*RIGHT)*0.3
-        atom1 = atoms[7].copy().shift(shift)
-        springs1 = set_springs(atoms[7].get_center(), atoms, shift)
-        atomm1 = atoms[7].copy().shift(-shift)
-        springsm1 = set_springs(atoms[7].get_center(), atoms, -shift)
+        # the central atom vibrates along shift, atoms and springs follow the amplitude
+        mode = np.zeros_like(rest)
+        mode[center] = (UP+2*RIGHT)*0.3
+        amplitude = ValueTracker(0)
+        atoms.add_updater(lambda m: m.set_positions(rest + amplitude.get_value()*mode))
+        springs.add_updater(lambda m: m.set_displacement(amplitude.get_value()*mode))
 
-        self.play(Transform(atoms[7], atom1),
-            Transform(springs, springs1))
+        self.play(amplitude.animate.set_value(1))
 
         self.next_slide(loop=True)
-        self.play(Transform(atoms[7], atomm1),
-            Transform(springs, springsm1))
-        self.play(Transform(atoms[7], atom1),
-            Transform(springs, springs1))
+        self.play(amplitude.animate.set_value(-1))
+        self.play(amplitude.animate.set_value(1))
         self.next_slide()
 
-        atoms[7].become(atom0)
-        springs.become(springs0)
-        # self.play(Transform(atoms[7], atom0),
-        #         Transform(springs, springs0))
+        amplitude.set_value(0)
+        for mobject in (atoms, springs):
+            mobject.update()
+            mobject.clear_updaters()
+        # self.play(amplitude.animate.set_value(0))
 
         # force_label = Tex("forces", color=YELLOW).scale(0.6).next_to(atoms, DOWN, aligned_edge=RIGHT, buff=0.3)
         # self.add(force_label)
@@ -181,12 +162,10 @@ class ForceConstants(Slide):
             Dot(axes.n2p(-lim - 0.1), color=GRAY, radius=0.03)
         )
 
-        atoms = VGroup()
-        for i in range(-lim, lim):
-            at1 = Dot(axes.n2p(i+0.2), color=RED, radius=0.2)
-            at2 = Dot(axes.n2p(i+0.6), color=BLUE, radius=0.4)
-            atoms.add(at1, at2)
-        old_atoms = atoms.copy()
+        atoms = AtomLattice(
+            [axes.n2p(i + x) for i in range(-lim, lim) for x in (0.2, 0.6)],
+            radii=[0.2, 0.4] * 2*lim, colors=[RED, BLUE] * 2*lim)
+        rest = atoms.positions
         three_dots_right = VGroup(
             Dot(axes.n2p(lim + 0.1), color=GRAY, radius=0.03),
             Dot(axes.n2p(lim + 0.2), color=GRAY, radius=0.03),
@@ -196,8 +175,11 @@ class ForceConstants(Slide):
         self.play(Create(axes))
         self.play(AnimationGroup(*[
             FadeIn(dot) for dot in three_dots_left], lag_ratio=0.1, run_time=0.5))
+        dots = atoms.dots()
         self.play(AnimationGroup(*[
-            FadeIn(atom) for atom in atoms], lag_ratio=0.1))
+            FadeIn(dot) for dot in dots], lag_ratio=0.1))
+        self.remove(dots)
+        self.add(atoms)
         self.play(AnimationGroup(*[
             FadeIn(dot) for dot in three_dots_right], lag_ratio=0.1, run_time=0.5))
         self.next_slide()
@@ -215,13 +197,14 @@ class ForceConstants(Slide):
                 self.play(Create(vecs[0]), Write(label_real))
             else:
                 self.play(ReplacementTransform(vecs[i-1], vecs[i]))
-            self.play([atoms[j].animate.shift(RIGHT*0.3) for j in range(i, len(atoms), 4)], run_time=0.5)
+            moved = slice(i, None, 4)
+            self.play(atoms.animate.displace(RIGHT*0.3, moved), run_time=0.5)
             # self.next_slide(auto_next=True)
             self.next_slide(loop=True)
-            self.play([atoms[j].animate.shift(LEFT*0.6) for j in range(i, len(atoms), 4)], run_time=0.5)
-            self.play([atoms[j].animate.shift(RIGHT*0.6) for j in range(i, len(atoms), 4)], run_time=0.5)
+            self.play(atoms.animate.displace(LEFT*0.6, moved), run_time=0.5)
+            self.play(atoms.animate.displace(RIGHT*0.6, moved), run_time=0.5)
             self.next_slide(auto_next=True)
-            [atoms[j].move_to(old_atoms[j].get_center()) for j in range(i, len(atoms), 4)]
+            atoms.set_positions(rest)
 
         label_reciprocal = Tex(r"reciprocal space").scale(0.6)
         xs = np.linspace(-lim, lim, 200)
@@ -252,24 +235,29 @@ class ForceConstants(Slide):
                 if i == 2:
                     self.play(ReplacementTransform(curve0, curve12), arr.animate.shift(UP*0.5), arr_label.animate.shift(UP*0.5))
             self.next_slide()
-            r = range(i%2, len(atoms), 2)
-            shifts = [f(axes.p2n(atoms[j].get_center())) for j in r]
-            self.play(*[atoms[j].animate.shift(RIGHT*0.3 * shift) for j, shift in zip(r, shifts)], run_time=0.5)
+            moved = slice(i%2, None, 2)
+            x = axes.p2n(atoms.positions[moved])
+            shifts = np.multiply.outer(np.broadcast_to(f(x), x.shape), RIGHT)
+            self.play(atoms.animate.displace(0.3 * shifts, moved), run_time=0.5)
             # self.next_slide(auto_next=True)
             self.next_slide(loop=True)
-            self.play(*[atoms[j].animate.shift(LEFT *0.6 * shift) for j, shift in zip(r, shifts)], run_time=0.5)
-            self.play(*[atoms[j].animate.shift(RIGHT*0.6 * shift) for j, shift in zip(r, shifts)], run_time=0.5)
+            self.play(atoms.animate.displace(-0.6 * shifts, moved), run_time=0.5)
+            self.play(atoms.animate.displace(0.6 * shifts, moved), run_time=0.5)
             self.next_slide()
-            [atoms[j].move_to(old_atoms[j].get_center()) for j in r]
+            atoms.set_positions(rest)
 
 
         self.play(FadeOut(curve12), FadeOut(vecs[-1]), FadeOut(label_reciprocal),
             FadeOut(arr), FadeOut(arr_label))
 
+        # Dots, so the 8 atoms grow into the 20 of the next lattice one by one
+        dots = atoms.dots()
+        self.remove(atoms)
+        self.add(dots)
         group_old = VGroup(
             axes,
             three_dots_left,
-            atoms,
+            dots,
             three_dots_right
         )
         lim = 5
@@ -2,6 +2,7 @@ from manim import *
 from random import random
 from numpy import sign
 from manim_slides import Slide
+from lattice import AtomLattice
 
 SCALE = 2
 SIZE_SI = 0.2
@@ -43,11 +44,9 @@ class Lattice1D(Slide):
             Dot(axes.n2p(-lim - 0.1), color=GRAY, radius=0.03)
         )
 
-        atoms = VGroup()
-        for i in range(-lim, lim):
-            at1 = Dot(axes.n2p(i+0.2), color=RED, radius=0.1)
-            at2 = Dot(axes.n2p(i+0.6), color=BLUE, radius=0.2)
-            atoms.add(at1, at2)
+        atoms = AtomLattice(
+            [axes.n2p(i + x) for i in range(-lim, lim) for x in (0.2, 0.6)],
+            radii=[0.1, 0.2] * 2*lim, colors=[RED, BLUE] * 2*lim)
         atoms.set_z_index(1)
         three_dots_right = VGroup(
             Dot(axes.n2p(lim + 0.1), color=GRAY, radius=0.03),
@@ -60,7 +59,7 @@ class Lattice1D(Slide):
         force_constants1 = MathTex(formula['force constants1']
                             ).scale(0.5).move_to(UP)
 
-        selected_atoms = VGroup([atoms[i].copy() for i in indices_fc])
+        selected_atoms = VGroup([atoms.atom(i) for i in indices_fc])
 
         selected_arrows = VGroup(
             [Arrow(
@@ -1,58 +1,16 @@
 from manim import *
 import numpy as np
-import matplotlib.pyplot as plt
-import os
-from matplotlib.colors import Normalize
 from manim_slides import Slide
+from lattice import AtomLattice
+from imshow import construct_imshow
 
-FAST = False
 formula = {
     'lattice_function': r"f(R_1, R_2) = f(R_1 + R, R_2+R)",
     'tau': r"\tau = 1 \\ \alpha = 1",
+    'rotations': r"$\bullet$ Rotations conserve integration volume: $d(U q_1) d(U q_2) = dq_1 dq_2$",
+    'scalar product': r"$\bullet$ Scalar product is rotationally invariant: $e^{i Uq \cdot UR} = e^{i q \cdot R}$",
 }
 
-# save only the imshow central image to an image object
-def construct_imshow(filename, function=None, extent=None, n_pixels=None):
-    x_vals = np.linspace(extent[0], extent[1], n_pixels)
-    y_vals = np.linspace(extent[2], extent[3], n_pixels)
-    X, Y = np.meshgrid(x_vals, y_vals)
-    Z = function(X, Y)
-
-    norm = Normalize(vmin=np.min(Z), vmax=np.max(Z))
-    Z_normalized = norm(Z)
-
-    # Get RGB using colormap
-    colored_image = plt.get_cmap('viridis')(Z_normalized)
-
-    # Create a fading mask based on distance from center
-    distances = np.zeros((4, x_vals.size, y_vals.size))
-    distances[0,:,:] = np.abs(X-extent[0])
-    distances[1,:,:] = np.abs(Y-extent[2])
-    distances[2,:,:] = np.abs(extent[1]-X)
-    distances[3,:,:] = np.abs(extent[3]-Y)
-    alpha_mask = np.arctan(np.min(distances, axis=0) * 2) / np.pi
-    # Apply mask to alpha channel
-    colored_image[..., 3] = alpha_mask  # Set alpha channel
-
-    window_1d = np.hanning(n_pixels)
-    window_2d = np.outer(window_1d, window_1d)
-    Z *= window_2d
-    # Compute the 2D Fourier Transform
-    # Z -= np.mean(Z)  # Remove the DC component
-    fft_result = np.fft.fft2(Z)  # Perform the 2D FFT
-    fft_shifted = np.fft.fftshift(fft_result)  # Shift the zero frequency to the center
-    # fft_result -= np.mean(fft_result)
-    fftZ = np.abs(fft_shifted)  # Compute the magnitude of the FFT
-    print(np.min(fftZ), np.max(fftZ))
-    norm = Normalize(vmin=np.min(fftZ), vmax=np.max(fftZ))
-    Z_normalized = norm(fftZ)
-    fft_image = plt.get_cmap('viridis')(fftZ)
-    fft_image[..., 3] = alpha_mask  # Set alpha channel
-
-
-    plt.imsave("fft_"+filename, fft_image, cmap='viridis', origin='lower')
-    plt.imsave(filename, colored_image, cmap='viridis', origin='lower')
-
 def f(x,y):
     return np.exp(-((x-y)*5)**6) * np.cos(np.pi/6 * (x-y)) + \
         np.exp(-((x-y-0.8)*5)**6) * np.cos(np.pi/6 * (x-y)) * (1-np.exp(-((x+y)*3)**2)/10)
@@ -92,13 +50,10 @@ class FourierRotation(Slide):
             Dot(axis.n2p(x_range[0] - 0.1), color=GRAY, radius=0.03)
         )
 
-        atoms = VGroup()
-        xatoms = VGroup()
-        yatoms = VGroup()
-        for i in range(x_range[0]+1, x_range[1]):
-            atoms.add(Dot(axis.n2p(i), color=RED, radius=0.1))
-            xatoms.add(Dot(axes.c2p(i, 0), color=RED, radius=0.1))
-            yatoms.add(Dot(axes.c2p(0, i), color=RED, radius=0.1))
+        sites = range(x_range[0]+1, x_range[1])
+        atoms = AtomLattice([axis.n2p(i) for i in sites], radii=0.1, colors=RED)
+        xatoms = AtomLattice([axes.c2p(i, 0) for i in sites], radii=0.1, colors=RED)
+        yatoms = AtomLattice([axes.c2p(0, i) for i in sites], radii=0.1, colors=RED)
 
         three_dots_right = VGroup(
             Dot(axis.n2p(x_range[1] + 0.1), color=GRAY, radius=0.03),
@@ -170,8 +125,7 @@ class FourierRotation(Slide):
         self.play(FadeOut(translation))
         self.play(FadeOut(labels), FadeOut(dots))
 
-        if not os.path.exists("fc.png") or FAST is False:
-            construct_imshow("fc.png", function=f, extent=[-3, 3, -3, 3], n_pixels=800)
+        construct_imshow("fc.png", function=f, extent=[-3, 3, -3, 3], n_pixels=800)
 
         imshow = ImageMobject("fc.png").move_to(axes).scale_to_fit_width(axes.width)
         self.play(FadeIn(imshow))
@@ -243,8 +197,8 @@ class FourierRotation(Slide):
         self.next_slide()
 
 
-        hyp1 = Tex(r"$\bullet$ Rotations conserve integration volume: $d(U q_1) d(U q_2) = dq_1 dq_2$").scale(0.6).next_to(new_fc, DOWN, buff=0.4).to_edge(LEFT)
-        hyp2 = Tex(r"$\bullet$ Scalar product is rotationally invariant: $e^{i Uq \cdot UR} = e^{i q \cdot R}$").scale(0.6).next_to(hyp1, DOWN, buff=0.2).to_edge(LEFT)
+        hyp1 = Tex(formula['rotations']).scale(0.6).next_to(new_fc, DOWN, buff=0.4).to_edge(LEFT)
+        hyp2 = Tex(formula['scalar product']).scale(0.6).next_to(hyp1, DOWN, buff=0.2).to_edge(LEFT)
         self.play(Unwrite(t))
         self.play(Write(hyp1), Write(hyp2))
         all = Group(qaxes, qimshow, qx_label, qy_label, arrow, arrow_label)
@@ -258,8 +212,8 @@ class Tree(Slide):
         scale = 0.7
         buff = 3
         new_fc = MathTex(r"f'(R_1-R_2, R_1+R_2) = f'(R_1-R_2)").to_edge(UP)
-        hyp1 = Tex(r"$\bullet$ Rotations conserve integration volume: $d(U q_1) d(U q_2) = dq_1 dq_2$").scale(0.6).next_to(new_fc, DOWN, buff=0.4).to_edge(LEFT)
-        hyp2 = Tex(r"$\bullet$ Scalar product is rotationally invariant: $e^{i Uq \cdot UR} = e^{i q \cdot R}$").scale(0.6).next_to(hyp1, DOWN, buff=0.2).to_edge(LEFT)
+        hyp1 = Tex(formula['rotations']).scale(0.6).next_to(new_fc, DOWN, buff=0.4).to_edge(LEFT)
+        hyp2 = Tex(formula['scalar product']).scale(0.6).next_to(hyp1, DOWN, buff=0.2).to_edge(LEFT)
         hyp3 = Tex(r"$\bullet$ $f'$ is constant on the second coordinate", color=BLUE).scale(0.6).next_to(hyp2, DOWN, buff=0.2).to_edge(LEFT)
 
         f1 = MathTex(r"f(R_1, R_2)").scale(scale).to_edge(LEFT,  buff=buff).shift(UP*0.6)
@@ -1,8 +1,6 @@
 from manim import *
 from manim_slides import Slide
-
-physics = TexTemplate()
-physics.add_to_preamble(r"\usepackage{physics}")
+from imshow import physics
 
 class DynamicalMatrix(Slide):
     def construct(self):
@@ -1,6 +1,8 @@
 from manim import *
 from imshow import construct_imshow
 from manim_slides import Slide
+from lattice import AtomLattice
+from assets import asset
 
 def create_label(labels):
     labs = [Tex(label).scale(0.6) for label in labels]
@@ -151,19 +153,17 @@ class Centering(Slide):
         )
         g = lambda x: np.exp(-x**2)
         fc = lambda x: np.sum([g(x - i) for i in range(-T*4, T*5, T)]) / 2
-        fc_points = VGroup([Dot(fc_graph.c2p(x, fc(x)), color=YELLOW) for x in np.arange(-T,T+0.1, 0.5)])
+        fc_points = AtomLattice([fc_graph.c2p(x, fc(x)) for x in np.arange(-T,T+0.1, 0.5)], colors=YELLOW)
 
         def translate(points, start, ax: Axes):
             shift = (ax.c2p(0.5, 0) - ax.c2p(0, 0)) * np.sign(start)
-            positions = np.array([ax.p2c(p.get_center())[0] for p in points])
+            positions = ax.p2c(points.positions)[:, 0]
             index = np.argmin(np.abs(positions-start))
-            r = range(index, len(points)) if start > 0 else range(index+1)
-            for i in r:
-                points[i].shift(shift)
+            points.displace(shift, slice(index, None) if start > 0 else slice(index+1))
 
         arrow = DoubleArrow(
-            start = fc_points[16].get_center(),
-            end=fc_points[-1].get_center(),
+            start = fc_points.positions[16],
+            end=fc_points.positions[-1],
             buff=0.2,
             color=YELLOW,
         )
@@ -274,15 +274,7 @@ class Centering(Slide):
         explain_label = Tex(r"1D, {{defect}}").scale(0.6).next_to(defect_graph.y_axis.get_start(), RIGHT, buff=0.2)
         explain_label[1].set(color=ORANGE)
 
-        # sigma_plus = 1
-        # sigma_minus = 0.1
-        # gauss_periodic = lambda x, y: np.exp(-(x-y)**2/sigma_minus) + np.exp(-(x-y-2)**2/sigma_minus) + \
-        #     np.exp(-(x-y+2)**2/sigma_minus)
-        # gauss = lambda x, y: np.exp(-(x-y)**2/sigma_minus - (x+y)**2/sigma_plus) + np.exp(-(x-y-2)**2/sigma_minus - (x+y-2)**2/sigma_plus) + \
-        #     np.exp(-(x-y+2)**2/sigma_minus - (x+y-2)**2/sigma_plus) + np.exp(-(x-y)**2/sigma_minus - (x+y-4)**2/sigma_plus)
-        # extent = [-1, lim, -1, lim]
-        # construct_imshow("gauss.png", gauss, extent, 800, mapp='magma')
-        # construct_imshow("gauss_periodic.png", gauss_periodic, extent, 800, mapp='magma')
+        # gauss.png and gauss_periodic.png are declared in assets.ASSETS (sigmas, extent)
 
 
         def create_replicas(obj, t):
@@ -298,11 +290,11 @@ class Centering(Slide):
         other_points = create_replicas(Dot(defect_graph.c2p(x_pos, y_pos), radius=0.06, color=WHITE), 2)
 
         bisettrice = defect_graph.plot(lambda x: x, color=WHITE, stroke_width=0.8)
-        img_periodic = ImageMobject("gauss_periodic.png"
+        img_periodic = ImageMobject(asset("gauss_periodic.png")
             ).move_to(defect_graph
             ).scale_to_fit_width(defect_graph.width
         )
-        img = ImageMobject("gauss.png"
+        img = ImageMobject(asset("gauss.png")
             ).move_to(defect_graph
             ).scale_to_fit_width(defect_graph.width
         )
@@ -374,7 +366,7 @@ class Centering(Slide):
             ).to_edge(LEFT, buff=2
             )
 
-        s0_img = ImageMobject("fc_exp.png"
+        s0_img = ImageMobject(asset("fc_exp.png")
             ).scale(0.5
             ).move_to(DOWN*1.1
             )
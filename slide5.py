@@ -1,5 +1,6 @@
 from manim import *
 from imshow import physics
+from bandplot import figure, transition
 from manim_slides import Slide
 # ricordati di mettere le fc che cadono in Centering
 
@@ -18,8 +19,8 @@ class Degeneracy(Slide, MovingCameraScene):
             ).to_edge(LEFT, buff=0.5
             )
 
-        s0_img = ImageMobject("bands01.png").scale(0.4).shift(DOWN)
-        s0_img_degen = ImageMobject("bands01_deg.png").scale(0.4).shift(DOWN)
+        s0_img = figure("bands01", scale=0.4, frame=self.camera.frame).shift(DOWN)
+        s0_img_degen = figure("bands01_deg", scale=0.4, frame=self.camera.frame).shift(DOWN)
 
         lim = 5
         s1_ax = NumberPlane(
@@ -115,10 +116,10 @@ class Degeneracy(Slide, MovingCameraScene):
             return VGroup( label, rect.copy())
 
 
-        s2_img = ImageMobject("lw_grid.png").scale(0.25).shift(DOWN)
-        s2_img_deg = ImageMobject("lw_grid_deg.png").scale(0.25).shift(DOWN)
+        s2_img = figure("lw_grid", scale=0.25).shift(DOWN)
+        s2_img_deg = figure("lw_grid_deg", scale=0.25).shift(DOWN)
 
-        s3_img = ImageMobject("lw_bands.png").scale(0.4).shift(DOWN)
+        s3_img = figure("lw_bands", scale=0.4).shift(DOWN)
 
         self.add(title)
         self.next_slide()
@@ -139,7 +140,7 @@ class Degeneracy(Slide, MovingCameraScene):
         self.next_slide()
 
 
-        self.play(ReplacementTransform(s0_img, s0_img_degen), run_time=0.5)
+        self.play(transition(s0_img, s0_img_degen), run_time=0.5)
         self.next_slide()
 
         self.play(Restore(self.camera.frame))
@@ -165,7 +166,7 @@ class Degeneracy(Slide, MovingCameraScene):
         self.play(FadeIn(s2_img))
         self.next_slide()
 
-        self.play(ReplacementTransform(s2_img, s2_img_deg))
+        self.play(transition(s2_img, s2_img_deg))
         self.next_slide()
 
         self.play(FadeOut(s2_img_deg))
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+import bandplot
+
+WIDTH, HEIGHT = 4.0, 3.0
+
+
+def box():
+    left, right = (bandplot.MARGINS["left"] - 0.5) * WIDTH, (bandplot.MARGINS["right"] - 0.5) * WIDTH
+    bottom, top = (bandplot.MARGINS["bottom"] - 0.5) * HEIGHT, (bandplot.MARGINS["top"] - 0.5) * HEIGHT
+    return left, right, bottom, top
+
+
+def band_path():
+    # Gamma - X | K - Gamma, the path breaks where x repeats
+    x = np.r_[np.linspace(0, 1, 11), np.linspace(1, 2.5, 16)]
+    bands = np.column_stack([3 * np.sin(x), 5 + np.cos(x), 9 + 0.5 * x])
+    return x, bands
+
+
+def draw(tmp_path, monkeypatch, **arrays):
+    monkeypatch.chdir(tmp_path)
+    np.savez("figure.npz", **arrays)
+    return bandplot.figure("figure", width=WIDTH, height=HEIGHT)
+
+
+def check_frame(result, n_labels):
+    left, right, bottom, top = box()
+    axes = result[0]
+    assert isinstance(axes, manim.Axes)
+    np.testing.assert_allclose(axes.c2p(0, 0), [left, bottom, 0], atol=1e-9)
+    assert axes.x_axis.get_length() == pytest.approx(right - left)
+    assert axes.y_axis.get_length() == pytest.approx(top - bottom)
+    texts = [m for m in result.get_family() if isinstance(m, manim.Text)]
+    assert len(texts) == n_labels
+
+
+def curves_inside(curves):
+    left, right, bottom, top = box()
+    points = np.concatenate([c.points for c in curves if len(c.points)])
+    assert (points[:, 0] >= left - 1e-9).all() and (points[:, 0] <= right + 1e-9).all()
+    assert (points[:, 1] >= bottom - 1e-9).all() and (points[:, 1] <= top + 1e-9).all()
+
+
+def test_bands(tmp_path, monkeypatch):
+    x, bands = band_path()
+    result = draw(tmp_path, monkeypatch, x=x, bands=bands, reference=bands + 0.1,
+                  ticks=[0, 1, 2.5], tick_labels=["Γ", "X|K", "Γ"], ylabel="ω (THz)")
+    # y ticks 0, 5, 10 and 15, three high-symmetry names and the y title
+    check_frame(result, 4 + 3 + 1)
+    # axes, markers, then a solid and a dashed path per band, then the title
+    assert len(result) == 1 + 1 + 2 * 3 + 1
+    curves_inside(result[2:-1])
+
+
+def test_bands_with_widths(tmp_path, monkeypatch):
+    x, bands = band_path()
+    result = draw(tmp_path, monkeypatch, x=x, bands=bands, widths=np.full_like(bands, 0.2),
+                  xlabel="q", ylabel="ω")
+    # y ticks -5 to 15, the lower edge of the widths dips below 0
+    check_frame(result, 5 + 2)
+    # unnamed markers at the ends and the break
+    assert len(result[1].points) == 3 * 4
+    assert len(result) == 1 + 1 + 2 * 3 + 2
+    curves_inside(result[2:-2])
+
+
+def test_scatter(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0.3, 17, 40)
+    result = draw(tmp_path, monkeypatch, x=x, y=rng.uniform(0.05, 0.75, 40), band=np.arange(40) % 3)
+    # x ticks 0, 5, ..., 20 and y ticks 0, 0.2, ..., 0.8
+    check_frame(result, 5 + 5)
+    assert len(result) == 1 + 3
+    curves_inside(result[1:])
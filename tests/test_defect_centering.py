@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+
+import defect_centering
+
+# a skewed cell, so that the shortest replicas are not the nearest in crystal coordinates
+CELL = np.array([[1.0, 0.0, 0.0], [0.6, 0.9, 0.0], [0.3, -0.4, 1.1]])
+SUPERCELL = (3, 3, 3)
+
+
+def brute_force(tau, defect, a, b, search=2, tol=1e-6):
+    """Every (T1, T2) of the pair (a, b) at the smallest perimeter."""
+    N = np.array(SUPERCELL)
+    D = defect @ CELL
+    rows = []
+    for T1, T2 in itertools.product(itertools.product(range(-search, search + 1), repeat=3), repeat=2):
+        A = (tau[a] + N * T1) @ CELL
+        B = (tau[b] + N * T2) @ CELL
+        rows.append((np.linalg.norm(A - D) + np.linalg.norm(B - D) + np.linalg.norm(A - B), T1, T2))
+    best = min(perimeter for perimeter, _, _ in rows)
+    return sorted((T1, T2) for perimeter, T1, T2 in rows if perimeter <= best * (1 + tol) + tol)
+
+
+def test_center_pairs_matches_brute_force():
+    rng = np.random.default_rng(7)
+    tau = np.array([[0, 0, 0], [0.5, 0.5, 0.5], [1.0, 0.5, 2.0]]) + rng.uniform(-0.1, 0.1, (3, 3))
+    defect = rng.uniform(0, 3, 3)
+    # a small chunk splits the pairs across several chunks
+    pair, T1, T2, weight = defect_centering.center_pairs(tau, CELL, SUPERCELL, defect, chunk=4)
+
+    assert np.array_equal(np.unique(pair), np.arange(9))
+    np.testing.assert_allclose(np.bincount(pair, weights=weight), 1)
+    for k, (a, b) in enumerate(itertools.product(range(3), repeat=2)):
+        rows = pair == k
+        found = sorted((tuple(t1), tuple(t2)) for t1, t2 in zip(T1[rows], T2[rows]))
+        assert found == brute_force(tau, defect, a, b)
+        np.testing.assert_allclose(weight[rows], 1 / rows.sum())
+
+
+def test_center_pairs_ties():
+    # an atom on the defect of a cubic cell: the partner's replicas tie in pairs
+    tau = np.array([[0, 0, 0], [1.5, 0, 0]])
+    pair, T1, T2, weight = defect_centering.center_pairs(
+        tau, np.eye(3), SUPERCELL, tau[0], pairs=[(0, 1)])
+    assert sorted(map(tuple, T2)) == [(-1, 0, 0), (0, 0, 0)]
+    assert (T1 == 0).all()
+    np.testing.assert_allclose(weight, 0.5)
+
+
+def test_center_pairs_empty():
+    tau = np.array([[0, 0, 0], [0.5, 0.5, 0.5]])
+    for pairs in ([], np.zeros((0, 2), dtype=int)):
+        pair, T1, T2, weight = defect_centering.center_pairs(tau, CELL, SUPERCELL, tau[0], pairs=pairs)
+        assert pair.shape == (0,) and weight.shape == (0,)
+        assert T1.shape == (0, 3) and T2.shape == (0, 3)
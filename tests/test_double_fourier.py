@@ -0,0 +1,41 @@
+import numpy as np
+
+import double_fourier
+import dynmat
+
+SUPERCELL = (2, 3)
+
+
+def direct(V):
+    """V(q, q') by the double sum of the definition."""
+    R = dynmat.q_grid(*SUPERCELL) * SUPERCELL
+    q = dynmat.q_grid(*SUPERCELL)
+    phase = np.exp(2j * np.pi * q @ R.T)                                # (q, R)
+    return np.einsum("qR,RSij,pS->qpij", phase.conj(), V, phase) / len(R)
+
+
+def test_transform_matches_the_double_sum(tmp_path):
+    rng = np.random.default_rng(5)
+    V = rng.normal(size=(6, 6, 2, 2))
+    # one cell per chunk in both passes
+    Vqq = double_fourier.transform(V, SUPERCELL, tmp_path / "Vqq.npy", memory=1)
+    assert isinstance(Vqq, np.memmap)
+    np.testing.assert_allclose(Vqq, direct(V), atol=1e-12)
+
+
+def test_stream_diagonal_for_translation_invariant_V(tmp_path):
+    rng = np.random.default_rng(6)
+    R = dynmat.q_grid(*SUPERCELL) * SUPERCELL
+    couplings = rng.normal(size=(*SUPERCELL, 2, 2))
+    # V(R, R') depends on R' - R only
+    shift = ((R[None] - R[:, None]) % SUPERCELL).astype(int)
+    V = couplings[shift[..., 0], shift[..., 1]]
+    rows = []
+    # two q rows per chunk
+    for q, block in double_fourier.stream(V, SUPERCELL, memory=800, scratch=tmp_path):
+        rows.append(q)
+        off = block.copy()
+        off[np.arange(len(q)), q] = 0
+        np.testing.assert_allclose(off, 0, atol=1e-12)
+    np.testing.assert_array_equal(np.concatenate(rows), np.arange(6))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+
+import dynfile
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+
+def expected_blocks(nq, nat):
+    iq, a, b, i, j = np.indices((nq, nat, nat, 3, 3))
+    return ((iq + 1) * 1000 + a * 100 + b * 10 + 3 * i + j) + 1j * (0.5 * (3 * i + j) - a)
+
+
+def test_read_dyn_round_trip(tmp_path, monkeypatch):
+    # blocks split over several batches
+    monkeypatch.setattr(dynfile, "BATCH", 3)
+    path = os.path.join(DATA, "synthetic.dyn1")
+    dyn = dynfile.read_dyn(path, cache_dir=tmp_path)
+
+    assert dyn.ibrav == 0
+    np.testing.assert_allclose(dyn.celldm, [10.2, 0, 0, 0, 0, 0])
+    np.testing.assert_allclose(dyn.cell, [[0, 0.5, 0.5], [0.5, 0, 0.5], [0.5, 0.5, 0]])
+    assert list(dyn.species) == ["Si", "C"]
+    np.testing.assert_allclose(dyn.masses, [25598.3668933, 10947.2235447])
+    np.testing.assert_allclose(dyn.positions, [[0, 0, 0], [0.25, 0.25, 0.25]])
+    np.testing.assert_allclose(dyn.q, [[0, 0, 0.5], [0, 0.5, 0], [0.5, 0, 0]])
+    np.testing.assert_allclose(dyn.blocks, expected_blocks(3, 2))
+
+    # the second read only opens the cache
+    def convert(path, entry):
+        raise AssertionError("converted twice")
+
+    monkeypatch.setattr(dynfile, "convert", convert)
+    again = dynfile.read_dyn(path, cache_dir=tmp_path)
+    assert isinstance(again.blocks, np.memmap)
+    np.testing.assert_array_equal(again.blocks, dyn.blocks)
@@ -0,0 +1,40 @@
+import numpy as np
+
+import dynmat
+import interpolation
+
+CELL = np.array([[1.0, 0.0], [0.4, 0.8]])
+SUPERCELL = (3, 4)
+
+
+def supercell_force_constants(rng, nat=2):
+    R = dynmat.q_grid(*SUPERCELL) * SUPERCELL
+    F = rng.normal(size=(len(R), nat, nat, 2, 2))
+    return F, R
+
+
+def test_center_reproduces_the_commensurate_grid():
+    rng = np.random.default_rng(3)
+    F, R = supercell_force_constants(rng)
+    tau = np.array([[0, 0], [0.45, 0.6]])
+    F_ws, L = interpolation.center(F, R, CELL, tau, SUPERCELL)
+    # replicas differ by N T, which has no phase on the grid
+    q = dynmat.q_grid(*SUPERCELL)
+    masses = [1.0, 2.5]
+    np.testing.assert_allclose(dynmat.dynamical_matrix(F_ws, L, masses, q),
+                               dynmat.dynamical_matrix(F, R, masses, q), atol=1e-12)
+
+
+def test_shortest_replicas():
+    R = dynmat.q_grid(*SUPERCELL) * SUPERCELL
+    tau = np.array([[0, 0], [0.5, 0.5]])
+    mask, weights, T = interpolation.shortest_replicas(R, CELL, tau, SUPERCELL)
+    np.testing.assert_allclose(weights.sum(axis=-1), 1)
+    for a in range(2):
+        for b in range(2):
+            vectors = (R[:, None] + T * SUPERCELL + tau[b] - tau[a]) @ CELL
+            distance = np.linalg.norm(vectors, axis=-1)
+            shortest = distance.min(axis=-1, keepdims=True)
+            assert np.array_equal(mask[a, b], np.isclose(distance, shortest, rtol=1e-6, atol=1e-6))
+    # the on-site term keeps only itself
+    assert mask[0, 0, 0].sum() == 1 and (T[mask[0, 0, 0]] == 0).all()
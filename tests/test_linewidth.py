@@ -0,0 +1,47 @@
+import numpy as np
+
+import double_fourier
+import dynmat
+import linewidth
+
+SUPERCELL = (2, 3)
+
+
+def random_modes(rng, nq, nb):
+    """Sorted energies (nq, nb) and unitary eigenvectors (nq, nb, nb)."""
+    A = rng.normal(size=(nq, nb, nb)) + 1j * rng.normal(size=(nq, nb, nb))
+    energies, modes = np.linalg.eigh(A + A.conj().swapaxes(1, 2))
+    return energies / 10 + 1, modes
+
+
+def test_linewidths_match_the_golden_rule(tmp_path):
+    rng = np.random.default_rng(11)
+    n, nb = 6, 2
+    V = rng.normal(size=(n, n, nb, nb))
+    # real symmetric: V[R, R', i, j] = V[R', R, j, i]
+    V = V + V.transpose(1, 0, 3, 2)
+    Vqq = double_fourier.transform(V, SUPERCELL, tmp_path / "Vqq.npy")
+    energies, modes = random_modes(rng, n, nb)
+
+    # Gamma_qs from V(q', -q) = 1/N sum exp(-2 pi i q'.R) V(R, R') exp(-2 pi i (-q).R')
+    R = dynmat.q_grid(*SUPERCELL) * SUPERCELL
+    phase = np.exp(2j * np.pi * dynmat.q_grid(*SUPERCELL) @ R.T)
+    sigma = 0.05
+    expected = np.zeros((n, nb))
+    for q in range(n):
+        for p in range(n):
+            Vpq = np.einsum("R,RSij,S->ij", phase[p].conj(), V, phase[q]) / n
+            element = modes[p].conj().T @ Vpq @ modes[q]                  # (s', s)
+            delta = linewidth.gaussian(energies[q][None] - energies[p][:, None], sigma)
+            expected[q] += (np.abs(element) ** 2 * delta).sum(axis=0)
+
+    for chunk in (None, 1, 4):
+        np.testing.assert_allclose(linewidth.linewidths(Vqq, energies, modes, sigma, chunk=chunk),
+                                   expected, rtol=1e-10)
+
+
+def test_smearings_are_normalized():
+    x = np.linspace(-50, 50, 200001)
+    for delta in linewidth.SMEARINGS.values():
+        # the lorentzian tails beyond the grid hold about 0.1%
+        np.testing.assert_allclose(np.trapezoid(delta(x, 0.1), x), 1, rtol=1e-2)
@@ -0,0 +1,45 @@
+import numpy as np
+import scipy.sparse
+
+import tmatrix
+
+
+def random_problem(rng, n=10):
+    energies = np.sort(rng.uniform(0, 1, n))
+    A = rng.normal(size=(n, n)) + 1j * rng.normal(size=(n, n))
+    return energies, 0.05 * (A + A.conj().T)
+
+
+def direct(energies, V, z):
+    """diag (1 - V G(z))^{-1} V with G(z) = (z - E)^{-1}, inverted at every z."""
+    n = len(energies)
+    return np.array([np.diagonal(np.linalg.solve(np.eye(n) - V / (energy - energies)[None], V))
+                     for energy in z])
+
+
+def test_tmatrix_matches_the_inverse():
+    rng = np.random.default_rng(2)
+    energies, V = random_problem(rng)
+    z = np.linspace(-0.2, 1.2, 7) + 0.01j
+    np.testing.assert_allclose(tmatrix.tmatrix(energies, V, z), direct(energies, V, z), rtol=1e-9)
+    np.testing.assert_allclose(tmatrix.tmatrix(energies, V, z, modes=[1, 4]),
+                               direct(energies, V, z)[:, [1, 4]], rtol=1e-9)
+
+
+def test_self_energies_at_the_mode_energies():
+    rng = np.random.default_rng(3)
+    energies, V = random_problem(rng)
+    eta = 1e-2
+    expected = [direct(energies, V, [energy + 1j * eta])[0, k] for k, energy in enumerate(energies)]
+    np.testing.assert_allclose(tmatrix.self_energies(energies, V, eta), expected, rtol=1e-9)
+    np.testing.assert_allclose(tmatrix.self_energies(energies, V, eta, modes=[2, 3]),
+                               expected[2:4], rtol=1e-9)
+
+
+def test_krylov_matches_the_eigendecomposition():
+    rng = np.random.default_rng(4)
+    energies, V = random_problem(rng)
+    z = np.array([0.3 + 0.05j, 0.9 + 0.05j])
+    modes = [0, 5, 9]
+    np.testing.assert_allclose(tmatrix.tmatrix_krylov(energies, scipy.sparse.csr_matrix(V), z, modes, tol=1e-12),
+                               tmatrix.tmatrix(energies, V, z, modes=modes), rtol=1e-6)
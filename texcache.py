@@ -0,0 +1,140 @@
+"""Compile every Tex/MathTex string of the slides into manim's tex cache.
+
+    python texcache.py --jobs 8
+
+The strings are collected statically from slide*.py: literals, concatenations
+of literals, module-level string constants and lookups in module-level dicts
+such as formula['lattice_matrix']. Strings built at render time (f-strings,
+DecimalNumber, axis labels) are left to the scenes.
+"""
+import argparse
+import ast
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+TEX_CLASSES = ("Tex", "MathTex")
+# keyword arguments that change the compiled file
+TEX_KWARGS = ("arg_separator", "tex_environment", "substrings_to_isolate")
+
+
+def module_constants(tree):
+    """Module-level names bound to literals, and the preambles of TexTemplates."""
+    constants, templates = {}, {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if isinstance(node.value, ast.Call) and getattr(node.value.func, "id", None) == "TexTemplate":
+                templates[name] = ()
+                continue
+            try:
+                constants[name] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            func = node.value.func
+            if isinstance(func, ast.Attribute) and func.attr == "add_to_preamble" \
+                    and getattr(func.value, "id", None) in templates:
+                templates[func.value.id] += (ast.literal_eval(node.value.args[0]),)
+    return constants, templates
+
+
+def imported_templates(tree):
+    """TexTemplates imported by name from repository modules."""
+    templates = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and os.path.exists(node.module + ".py"):
+            with open(node.module + ".py") as f:
+                _, module_templates = module_constants(ast.parse(f.read()))
+            for alias in node.names:
+                if alias.name in module_templates:
+                    templates[alias.asname or alias.name] = module_templates[alias.name]
+    return templates
+
+
+def resolve(node, constants):
+    """Value of a string expression, or None if it is only known at render time."""
+    if isinstance(node, ast.Constant):
+        return node.value if isinstance(node.value, str) else None
+    if isinstance(node, ast.Name):
+        value = constants.get(node.id)
+        return value if isinstance(value, str) else None
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = resolve(node.left, constants), resolve(node.right, constants)
+        return left + right if left is not None and right is not None else None
+    if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+        table = constants.get(node.value.id)
+        try:
+            value = table[ast.literal_eval(node.slice)]
+        except (ValueError, TypeError, KeyError, IndexError):
+            return None
+        return value if isinstance(value, str) else None
+    return None
+
+
+def collect(files):
+    """Distinct (class, strings, preamble, kwargs) of the Tex/MathTex calls in files."""
+    found = set()
+    for path in files:
+        with open(path) as f:
+            tree = ast.parse(f.read())
+        constants, templates = module_constants(tree)
+        templates = {**imported_templates(tree), **templates}
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and getattr(node.func, "id", None) in TEX_CLASSES):
+                continue
+            strings = tuple(resolve(arg, constants) for arg in node.args)
+            if not strings or None in strings:
+                continue
+            preamble, kwargs = (), []
+            for keyword in node.keywords:
+                if keyword.arg == "tex_template":
+                    if getattr(keyword.value, "id", None) not in templates:
+                        break
+                    preamble = templates[keyword.value.id]
+                elif keyword.arg in TEX_KWARGS:
+                    try:
+                        value = ast.literal_eval(keyword.value)
+                    except ValueError:
+                        break
+                    kwargs.append((keyword.arg, tuple(value) if isinstance(value, list) else value))
+            else:
+                found.add((node.func.id, strings, preamble, tuple(sorted(kwargs))))
+    return sorted(found)
+
+
+def compile_tex(entry):
+    # building the mobject writes its svg to media/Tex, where scenes find it
+    import manim
+    manim.config.no_latex_cleanup = True
+    cls, strings, preamble, kwargs = entry
+    kwargs = dict(kwargs)
+    if preamble:
+        kwargs["tex_template"] = manim.TexTemplate()
+        for line in preamble:
+            kwargs["tex_template"].add_to_preamble(line)
+    getattr(manim, cls)(*strings, **kwargs)
+
+
+def precompile(entries, jobs=None):
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(compile_tex, entries, chunksize=max(1, len(entries) // (4 * (jobs or os.cpu_count())))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", default=sorted(glob.glob("slide*.py")))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    start = time.perf_counter()
+    entries = collect(args.files)
+    precompile(entries, max(1, args.jobs))
+    print(f"{len(entries)} tex strings compiled in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Non-perturbative defect self-energies, E = <qs|(1 - V G)^{-1} V|qs>.
+
+    sigma = self_energies(omega**2, V, eta=1e-3)       # each mode at its own energy
+    T = tmatrix(omega**2, V, z=np.linspace(0, 1, 500) + 1e-3j)
+
+energies are the unperturbed E_qs (E := omega^2) and V the defect
+perturbation in the same eigenbasis, an (n, n) Hermitian matrix over all
+(q, s). With H = diag(E) + V the perturbed matrix,
+
+    (1 - V G(z))^{-1} V = V + V (z - H)^{-1} V
+
+so diagonalizing H = U diag(lambda) U^H once gives every energy at the cost of
+one product: T_kk(z) = V_kk + sum_m |(U^H V)_mk|^2 / (z - lambda_m). No
+(1 - V G) is formed or inverted per energy. Re T is the energy shift and
+-Im T the decay rate. tmatrix_krylov solves (z - H) x = V|k> iteratively
+instead, for supercells too large for a dense eigendecomposition.
+"""
+import numpy as np
+
+
+def _spectral(energies, V):
+    """Eigenvalues of H and the weights |(U^H V)_mk|^2 (m, k)."""
+    H = np.diag(np.asarray(energies, dtype=float)) + V
+    lam, U = np.linalg.eigh(H)
+    return lam, np.abs(U.conj().T @ V) ** 2
+
+
+def tmatrix(energies, V, z, modes=None):
+    """T_kk(z) (nz, nk) for the complex energies z and the modes k (default all)."""
+    lam, weights = _spectral(energies, V)
+    modes = slice(None) if modes is None else modes
+    resolvent = 1 / (np.atleast_1d(z)[:, None] - lam[None])         # (nz, m)
+    return np.diagonal(V)[modes] + resolvent @ weights[:, modes]
+
+
+def self_energies(energies, V, eta, modes=None):
+    """T_kk(E_k + i eta) (nk,), every mode at its own unperturbed energy."""
+    lam, weights = _spectral(energies, V)
+    modes = np.arange(len(lam)) if modes is None else np.asarray(modes)
+    z = np.asarray(energies, dtype=float)[modes] + 1j * eta
+    resolvent = 1 / (z[:, None] - lam[None])                        # (k, m)
+    return np.diagonal(V)[modes] + np.einsum("km,mk->k", resolvent, weights[:, modes])
+
+
+def tmatrix_krylov(energies, V, z, modes, tol=1e-8, maxiter=None):
+    """T_kk(z) (nz, nk) by GMRES on (z - H) x = V|k>; V may be any scipy
+    sparse matrix or LinearOperator, only products with it are used."""
+    from scipy.sparse.linalg import LinearOperator, aslinearoperator, gmres
+
+    energies = np.asarray(energies, dtype=float)
+    n = len(energies)
+    V = aslinearoperator(V)
+    T = np.empty((len(np.atleast_1d(z)), len(modes)), dtype=complex)
+    for a, energy in enumerate(np.atleast_1d(z)):
+        shifted = LinearOperator((n, n), dtype=complex,
+                                 matvec=lambda x, e=energy: (e - energies) * x - V.matvec(x))
+        for b, k in enumerate(modes):
+            unit = np.zeros(n)
+            unit[k] = 1
+            column = V.matvec(unit).astype(complex)
+            x, info = gmres(shifted, column, rtol=tol, maxiter=maxiter)
+            if info:
+                raise RuntimeError(f"GMRES did not converge for mode {k} at z={energy}")
+            # <k|V|k> + <k|V (z - H)^{-1} V|k>, V Hermitian
+            T[a, b] = column[k] + column.conj() @ x
+    return T